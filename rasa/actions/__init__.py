@@ -3,6 +3,7 @@
 
 """Rasa custom actions for the chatbot."""
 
+from . import utils
 from ._booking import (
     AskBookingAuthor,
     AskBookingDateTime,
@@ -35,6 +36,7 @@ from ._search import (
     CancelSearch,
     ChangeSearchRankBy,
     CreateSearch,
+    FilterSearchResultsByOpeningHours,
     Search,
     SearchParameters,
     SetSearchActivity,
@@ -94,6 +96,7 @@ __all__ = [
     "CancelSearch",
     "ChangeSearchRankBy",
     "CreateSearch",
+    "FilterSearchResultsByOpeningHours",
     "Search",
     "SearchParameters",
     "SetSearchActivity",
@@ -112,3 +115,7 @@ __all__ = [
     "SetSelectedSearches",
     "ShowSelectedSearches",
 ]
+
+# the action server imports this package after creating its application, so the
+# listener closing the pooled HTTP session of the Duckling client can be attached
+utils.close_duckling_client_on_shutdown()
@@ -4,7 +4,6 @@
 from datetime import datetime
 from typing import Any
 
-from gcp.maps import places
 from rasa_sdk import Action, Tracker
 from rasa_sdk.events import SlotSet
 from rasa_sdk.executor import CollectingDispatcher
@@ -71,7 +70,7 @@ class SetBookingDateTime(Action):
             ]
 
         place = utils.get_slot(tracker, "booking_place")
-        place = utils.deserialize(places.Place, place)
+        place = await utils.deserialize_place(place)
 
         if not utils.is_place_open(place, date):
             return [
@@ -346,7 +345,10 @@ class StartBooking(Action):
             booking = store.get_booking(history[idx])
 
             return [
-                SlotSet("booking_place", utils.serialize(booking.parameters.place)),
+                SlotSet(
+                    "booking_place",
+                    utils.serialize_place(booking.parameters.place),
+                ),
                 SlotSet("booking_datetime", booking.parameters.date.isoformat()),
                 SlotSet("booking_datetime_error", None),
                 SlotSet("booking_people_count", booking.parameters.num_people),
@@ -375,7 +377,7 @@ class StartBooking(Action):
         return [
             SlotSet("booking_history", history),
             SlotSet("selected_bookings", [len(history) - 1]),
-            SlotSet("booking_place", utils.serialize(result)),
+            SlotSet("booking_place", utils.serialize_place(result)),
             SlotSet("booking_datetime", None),
             SlotSet("booking_datetime_error", None),
             SlotSet("booking_people_count", None),
@@ -446,7 +448,7 @@ class CreateBooking(Action):
         idx = utils.get_slot(tracker, "selected_bookings", [])[0]
 
         place = utils.get_slot(tracker, "booking_place")
-        place = utils.deserialize(places.Place, place)
+        place = await utils.deserialize_place(place)
         date = datetime.fromisoformat(utils.get_slot(tracker, "booking_datetime"))
         count = utils.get_slot(tracker, "booking_people_count")
         author = utils.get_slot(tracker, "booking_author")
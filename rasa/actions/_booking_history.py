@@ -82,7 +82,7 @@ class SetSelectedBookings(Action):
             datetimes.extend(await utils.parse_times(entity))
         if datetimes:
             store = utils.get_kv_store()
-            bookings = [store.get_booking(key) for key in history]
+            bookings = store.get_bookings(history)
             for dt in datetimes:
                 selected.extend(_get_bookings(bookings, dt))
 
@@ -123,13 +123,12 @@ class ShowSelectedBookings(Action):
             msg = f"Here is the selected booking: {title}"
         elif len(selected) == len(history):
             msg = "Here is your booking activity:\n"
-            for idx, booking_key in enumerate(history):
-                booking = store.get_booking(booking_key)
+            for idx, booking in enumerate(store.get_bookings(history)):
                 msg += f"{idx + 1}. {utils.get_booking_title(booking.parameters)}\n"
         else:
             msg = "Here are the selected bookings:\n"
-            for idx in selected:
-                booking = store.get_booking(history[idx])
+            bookings = store.get_bookings([history[idx] for idx in selected])
+            for idx, booking in zip(selected, bookings, strict=True):
                 msg += f"{idx + 1}. {utils.get_booking_title(booking.parameters)}\n"
 
         dispatcher.utter_message(text=msg)
@@ -151,8 +150,12 @@ class DeleteSelectedBookings(Action):
     ) -> list[dict[str, Any]]:
         history = utils.get_slot(tracker, "booking_history", [])
         selected = set(utils.get_slot(tracker, "selected_bookings", []))
+        deleted = [book for idx, book in enumerate(history) if idx in selected]
         history = [book for idx, book in enumerate(history) if idx not in selected]
 
+        # the deleted bookings are no longer reachable, so we free their memory
+        utils.get_kv_store().delete_bookings(deleted)
+
         dispatcher.utter_message(response="utter_deleted_bookings")
 
         return [
@@ -186,8 +189,7 @@ class ConfirmDeleteSelectedBookings(Action):
             msg = "Are you sure you want to delete all your bookings?"
         else:
             msg = "Are you sure you want to delete the following bookings?\n"
-            for idx in selected:
-                booking = store.get_booking(history[idx])
+            for booking in store.get_bookings([history[idx] for idx in selected]):
                 msg += f"- {utils.get_booking_title(booking.parameters)}\n"
 
         dispatcher.utter_message(text=msg)
@@ -1,6 +1,7 @@
 # Copyright 2024 Francesco Gentile.
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 from datetime import datetime, time
 from typing import Any
 
@@ -13,6 +14,10 @@ from rasa_sdk.types import DomainDict
 
 from . import utils
 
+# the maximum number of information lookups (e.g. searches of nearby parkings)
+# running at the same time
+_MAX_CONCURRENT_LOOKUPS = 8
+
 
 @utils.handle_action_exceptions
 class RetrievePlaceInfo(Action):
@@ -40,24 +45,20 @@ class RetrievePlaceInfo(Action):
 
         results = [search.results[i] for i in selected]
 
+        infos = iter(await _retrieve_infos(intents, results, entities))
+
         msg = ""
-        for place in results:
+        for _ in results:
             if len(results) > 1:
                 msg += "- "
-            for idx, intent in enumerate(intents):
+            for idx in range(len(intents)):
                 if idx > 0:
                     if idx == len(utils.get_last_intents(tracker)) - 1:
                         msg += " and "
                     else:
                         msg += ", "
 
-                # use the name of the place instead of the pronoun if
-                # it's the first information to be provided and such information
-                # is asked for multiple places
-                name = place.display_name if idx == 0 else None
-                name = name.text if name else None
-
-                msg += await INTENT_TO_INFO[intent](place, name, entities)
+                msg += next(infos)
             msg += "\n"
 
         dispatcher.utter_message(text=msg)
@@ -100,6 +101,40 @@ def _get_intents(tracker: Tracker) -> tuple[list[str], list[dict[str, Any]]]:
     return intents, entities
 
 
+async def _retrieve_infos(
+    intents: list[str],
+    results: list[places.Place],
+    entities: list[dict[str, Any]],
+) -> list[str]:
+    """Returns the requested information, grouped by place and sorted by intent.
+
+    The times are parsed only once, and the information about all the places is
+    retrieved concurrently.
+    """
+    datetimes: list[utils.Time] = []
+    for entity in entities:
+        if entity["entity"] == "datetime":
+            datetimes.extend(await utils.parse_times(entity["value"]))
+
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_LOOKUPS)
+
+    async def get_info(intent: str, place: places.Place, name: str | None) -> str:
+        async with semaphore:
+            return await INTENT_TO_INFO[intent](place, name, datetimes)
+
+    lookups = []
+    for place in results:
+        for idx, intent in enumerate(intents):
+            # use the name of the place instead of the pronoun if
+            # it's the first information to be provided and such information
+            # is asked for multiple places
+            name = place.display_name if idx == 0 else None
+            name = name.text if name else None
+            lookups.append(get_info(intent, place, name))
+
+    return await asyncio.gather(*lookups)
+
+
 async def _get_address(place: places.Place, name: str | None, *_args: Any) -> str:
     address = place.short_formatted_address
     msg = f"the address of {name} is {address}" if name else f"its address is {address}"
@@ -326,7 +361,7 @@ async def _get_takeout(place: places.Place, name: str | None, *_args: Any) -> st
 async def _get_opening_hours(  # noqa: C901, PLR0912, PLR0915
     place: places.Place,
     name: str | None,
-    entities: list[dict[str, Any]],
+    datetimes: list[utils.Time],
 ) -> str:
     if place.regular_opening_hours is None:
         msg = f"unfortunately, it seems that {name} doesn't provide any information "
@@ -334,11 +369,6 @@ async def _get_opening_hours(  # noqa: C901, PLR0912, PLR0915
         return msg
 
     name = name or "it"
-    datetimes: list[utils.Time] = []
-    for entity in entities:
-        if entity["entity"] == "datetime":
-            datetimes.extend(await utils.parse_times(entity["value"]))
-
     now = datetime.now()  # noqa: DTZ005
 
     if len(datetimes) == 0:
@@ -436,17 +466,11 @@ async def _get_opening_hours(  # noqa: C901, PLR0912, PLR0915
 
 
 def _get_day_schedule(place: places.Place, wd: int, name: str) -> str:
-    if place.regular_opening_hours is None:
-        raise RuntimeError
-
     day = WEEKDAYS[wd]
-    periods = place.regular_opening_hours.periods[wd]
-    # If the place opens the day before and closes at 00:00, the periods list
-    # will contain a tuple (None, 00:00) for the current day.
-    # However, we do not want to say that for the current day the place is open
-    # until 00:00 (the user may think that the place is open for 24 hours),
-    # so we remove it.
-    periods = [(s, e) for s, e in periods if s is not None or e != time(0, 0)]
+    # The periods of a place that opens the day before and closes at 00:00 do not
+    # include the current day, so that we do not say that the place is open until
+    # 00:00 (the user may think that the place is open for 24 hours).
+    periods = utils.OpeningHoursIndex.from_place(place).get_day_periods(wd)
     if len(periods) == 0:
         return f"on {day}, {name} is closed"
 
@@ -461,7 +485,7 @@ def _get_day_schedule(place: places.Place, wd: int, name: str) -> str:
 
         match start, end:
             case None, None:
-                msg = "all day"
+                msg += "all day"
             case None, _:
                 msg += f"until {end.strftime('%I:%M %p')}"  # type: ignore
             case _, None:
@@ -473,50 +497,13 @@ def _get_day_schedule(place: places.Place, wd: int, name: str) -> str:
     return msg
 
 
-def _get_intervals(  # noqa: C901, PLR0912
+def _get_intervals(
     place: places.Place,
     start: datetime,
     end: datetime,
 ) -> list[tuple[time, time]]:
-    if place.regular_opening_hours is None:
-        raise RuntimeError
-
-    periods = place.regular_opening_hours.periods[start.weekday()]
-    if len(periods) == 0:
-        return []
-
-    if periods[0] == (None, None):
-        return [(start.time(), end.time())]
-
-    intervals = []
-    for s, e in periods:
-        match s, e:
-            case None, None:
-                continue
-            case None, _:
-                assert e is not None  # noqa: S101
-                if e < start.time():
-                    continue
-                if e > end.time():
-                    intervals.append((start.time(), end.time()))
-                else:
-                    intervals.append((start.time(), e))
-            case _, None:
-                assert s is not None  # noqa: S101
-                if s > end.time():
-                    continue
-                if s < start.time():
-                    intervals.append((start.time(), end.time()))
-                else:
-                    intervals.append((s, end.time()))
-            case _:
-                if e < start.time() or s > end.time():
-                    continue
-                s = max(s, start.time())  # noqa: PLW2901
-                e = min(e, end.time())  # noqa: PLW2901
-                intervals.append((s, e))
-
-    return intervals
+    index = utils.OpeningHoursIndex.from_place(place)
+    return [(s.time(), e.time()) for s, e in index.get_open_intervals(start, end)]
 
 
 INTENT_TO_INFO = {
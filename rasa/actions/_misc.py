@@ -127,12 +127,7 @@ class Restart(Action):
         # clear the database to avoid it growing indefinitely
         store = utils.get_kv_store()
 
-        search_history = utils.get_slot(tracker, "search_history", [])
-        for key in search_history:
-            store.delete_search(key)
-
-        booking_history = utils.get_slot(tracker, "booking_history", [])
-        for key in booking_history:
-            store.delete_booking(key)
+        store.delete_searches(utils.get_slot(tracker, "search_history", []))
+        store.delete_bookings(utils.get_slot(tracker, "booking_history", []))
 
         return [Restarted()]
@@ -1,9 +1,8 @@
 # Copyright 2024 Francesco Gentile.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Any
+from typing import Any, Literal
 
-from gcp.maps import places
 from rasa_sdk import Action, FormValidationAction, Tracker
 from rasa_sdk.events import FollowupAction, SlotSet
 from rasa_sdk.executor import CollectingDispatcher
@@ -15,6 +14,8 @@ from . import utils
 from .records import SearchData, SearchParameters
 
 _PAGE_SIZE = 5
+# the maximum number of results retrieved by a search
+_MAX_RESULTS = 15
 _ALTERNATIVE_PARAMETERS = [
     "activity",
     "meal_type",
@@ -135,7 +136,7 @@ class SetSearchLocation(Action):
 
         candidates = await utils.find_location(
             entity,
-            utils.deserialize(places.Place, user_location) if user_location else None,
+            await utils.deserialize_place(user_location) if user_location else None,
         )
         if len(candidates) != 1:
             error.append(("ambiguous" if candidates else "not_found", entity))
@@ -145,7 +146,7 @@ class SetSearchLocation(Action):
                 SlotSet("search_location_error", error),
             ]
 
-        location = utils.serialize(candidates[0])
+        location = utils.serialize_place(candidates[0])
         slots = [
             SlotSet("search_location", location),
             SlotSet("search_location_error", None),
@@ -378,7 +379,10 @@ class StartSearch(Action):
             search = utils.get_kv_store().get_search(history[idx])
 
             return [
-                SlotSet("search_location", utils.serialize(search.parameters.location)),
+                SlotSet(
+                    "search_location",
+                    utils.serialize_place(search.parameters.location),
+                ),
                 SlotSet("search_location_error", None),
                 SlotSet("search_place_type", search.parameters.place_type),
                 SlotSet("search_place_type_error", None),
@@ -435,7 +439,7 @@ class CreateSearch(Action):
         idx = utils.get_slot(tracker, "selected_searches", [])[0]
 
         location = utils.get_slot(tracker, "search_location")
-        location = utils.deserialize(places.Place, location)
+        location = await utils.deserialize_place(location)
 
         parameters = SearchParameters(
             location=location,
@@ -522,7 +526,7 @@ class Search(Action):
         store = utils.get_kv_store()
         search = store.get_search(history[idx])
 
-        results = await utils.find_places(search.parameters)
+        results = await utils.find_places(search.parameters, _MAX_RESULTS)
         if len(results) == 0:
             if search.results is None:
                 msg = "I couldn't find any places matching your search criteria. "
@@ -574,6 +578,7 @@ class Search(Action):
                     msg += f"{i}. {utils.get_place_title(result)}\n"
 
         search.results = results
+        search.relevance_ranks = None
         store.update_search(history[idx], search)
 
         dispatcher.utter_message(msg)
@@ -603,20 +608,10 @@ class ChangeSearchRankBy(Action):
         tracker: Tracker,
         domain: DomainDict,
     ) -> list[dict[str, Any]]:
-        rank_by = None
-        for intent in utils.get_last_intents(tracker):
-            match intent:
-                case "rank_results_by_relevance":
-                    rank_by = "relevance"
-                    break
-                case "rank_results_by_distance":
-                    rank_by = "distance"
-                    break
-                case "rank_results_by_unsupported":
-                    dispatcher.utter_message(response="utter_unsupported_rank_by")
-                    return []
-                case _:
-                    continue
+        rank_by = _get_requested_rank_by(tracker)
+        if rank_by == "unsupported":
+            dispatcher.utter_message(response="utter_unsupported_rank_by")
+            return []
 
         if rank_by is None:
             msg = "rank_by is None, but it should not be."
@@ -640,7 +635,11 @@ class ChangeSearchRankBy(Action):
             dispatcher.utter_message(response="utter_changed_rank_by", rank_by=rank_by)
             return []
 
-        results = await utils.find_places(search.parameters)
+        if not _rerank_locally(search, rank_by):
+            search.results = await utils.find_places(search.parameters, _MAX_RESULTS)
+            search.relevance_ranks = None
+
+        results = search.results or []
         if len(results) <= _PAGE_SIZE:
             msg = f"Here are all the results sorted by {rank_by}:"
         else:
@@ -649,7 +648,6 @@ class ChangeSearchRankBy(Action):
         for i, result in enumerate(results[:_PAGE_SIZE], start=1):
             msg += f"\n{i}. {utils.get_place_title(result)}"
 
-        search.results = results
         store.update_search(history[idx], search)
 
         dispatcher.utter_message(msg)
@@ -657,6 +655,131 @@ class ChangeSearchRankBy(Action):
         return [SlotSet("selected_results", list(range(min(len(results), _PAGE_SIZE))))]
 
 
+def _get_requested_rank_by(
+    tracker: Tracker,
+) -> Literal["relevance", "distance", "unsupported"] | None:
+    """Returns the ranking requested by the user in the last message.
+
+    Returns:
+        `relevance`, `distance` or `unsupported`, or `None` if no ranking was
+        requested.
+    """
+    for intent in utils.get_last_intents(tracker):
+        match intent:
+            case "rank_results_by_relevance":
+                return "relevance"
+            case "rank_results_by_distance":
+                return "distance"
+            case "rank_results_by_unsupported":
+                return "unsupported"
+            case _:
+                continue
+
+    return None
+
+
+def _rerank_locally(
+    search: SearchData,
+    rank_by: Literal["relevance", "distance"],
+) -> bool:
+    """Re-ranks the results of a search without searching again.
+
+    Returns:
+        Whether the results were re-ranked. If not, they must be retrieved again.
+    """
+    results = search.results or []
+    match rank_by:
+        case "distance":
+            # a full list of results may miss places closer to the location than
+            # the ones retrieved, while a shorter one contains all the matches
+            if len(results) >= _MAX_RESULTS:
+                return False
+
+            order = utils.rank_by_distance(results, search.parameters.location)
+            if order is None:
+                return False
+
+            ranks = search.relevance_ranks or list(range(len(results)))
+            search.results = [results[i] for i in order]
+            search.relevance_ranks = [ranks[i] for i in order]
+            return True
+        case "relevance":
+            if search.relevance_ranks is None:
+                return False
+
+            order = sorted(range(len(results)), key=search.relevance_ranks.__getitem__)
+            search.results = [results[i] for i in order]
+            search.relevance_ranks = None
+            return True
+        case _:
+            return False
+
+
+@utils.handle_action_exceptions
+class FilterSearchResultsByOpeningHours(Action):
+    """Action to show only the search results that are open at a given time."""
+
+    def name(self) -> str:
+        return "action_filter_search_results_by_opening_hours"
+
+    async def run(
+        self,
+        dispatcher: CollectingDispatcher,
+        tracker: Tracker,
+        domain: DomainDict,
+    ) -> list[dict[str, Any]]:
+        window = None
+        for entity in utils.get_entity_values(tracker, "datetime"):
+            times = await utils.parse_times(entity)
+            if times:
+                window = times[0]
+                break
+
+        match window:
+            case utils.Instant(value, grain) if grain in ["second", "minute", "hour"]:
+                start, end = value, value
+            case utils.Interval(start, end) if end is not None:
+                start, end = start.value, end.value
+            case _:
+                dispatcher.utter_message(response="utter_ask_opening_hours_time")
+                return []
+
+        history = utils.get_slot(tracker, "search_history", [])
+        idx = utils.get_slot(tracker, "selected_searches")[0]
+        store = utils.get_kv_store()
+        search = store.get_search(history[idx])
+
+        if not search.results:
+            dispatcher.utter_message(response="utter_no_results_to_filter")
+            return []
+
+        # the stored results are left untouched, so that the closed places are
+        # still available afterwards: the open ones are only shown and selected,
+        # numbered by their position among all the results
+        mask = utils.get_open_mask(search.results, start, end)
+        kept = [i for i, is_open in enumerate(mask) if is_open]
+        if end > start:
+            when = f"from {start.strftime('%A %I:%M %p')} to {end.strftime('%I:%M %p')}"
+        else:
+            when = f"on {start.strftime('%A at %I:%M %p')}"
+
+        if len(kept) == 0:
+            dispatcher.utter_message(f"None of the results is open {when}.")
+            return []
+
+        if len(kept) <= _PAGE_SIZE:
+            msg = f"Here are the results that are open {when}:"
+        else:
+            msg = f"Here are the top {_PAGE_SIZE} results that are open {when}:"
+
+        for i in kept[:_PAGE_SIZE]:
+            msg += f"\n{i + 1}. {utils.get_place_title(search.results[i])}"
+
+        dispatcher.utter_message(msg)
+
+        return [SlotSet("selected_results", kept[:_PAGE_SIZE])]
+
+
 # --------------------------------------------------------------------------- #
 # Search parameters Actions
 # --------------------------------------------------------------------------- #
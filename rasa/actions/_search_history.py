@@ -136,13 +136,12 @@ class ShowSelectedSearches(Action):
                     msg += f"{i + 1}. {utils.get_place_title(result)}\n"
         elif len(selected) == len(history):
             msg = "Here is your search history:\n"
-            for idx, search_id in enumerate(history):
-                search = store.get_search(search_id)
+            for idx, search in enumerate(store.get_searches(history)):
                 msg += f"{idx + 1}. {utils.get_search_title(search.parameters)}\n"
         else:
             msg = "Here are the selected searches:\n"
-            for idx in selected:
-                search = store.get_search(history[idx])
+            searches = store.get_searches([history[idx] for idx in selected])
+            for idx, search in zip(selected, searches, strict=True):
                 msg += f"{idx + 1}. {utils.get_search_title(search.parameters)}\n"
 
         dispatcher.utter_message(text=msg)
@@ -164,8 +163,12 @@ class DeleteSelectedSearches(Action):
     ) -> list[dict[str, Any]]:
         history = utils.get_slot(tracker, "search_history", [])
         selected = set(utils.get_slot(tracker, "selected_searches", []))
+        deleted = [search for i, search in enumerate(history) if i in selected]
         history = [search for i, search in enumerate(history) if i not in selected]
 
+        # the deleted searches are no longer reachable, so we free their memory
+        utils.get_kv_store().delete_searches(deleted)
+
         dispatcher.utter_message(response="utter_deleted_searches")
         return [SlotSet("search_history", history), SlotSet("selected_searches", None)]
 
@@ -195,8 +198,7 @@ class ConfirmDeleteSelectedSearches(Action):
             msg = "Are you sure you want to delete all your search history?"
         else:
             msg = "Are you sure you want to delete the following searches?\n"
-            for idx in selected:
-                search = store.get_search(history[idx])
+            for search in store.get_searches([history[idx] for idx in selected]):
                 msg += f"- {utils.get_search_title(search.parameters)}\n"
 
         dispatcher.utter_message(text=msg)
@@ -49,7 +49,16 @@ class SearchParameters:
 
 @dataclasses.dataclass
 class SearchData:
-    """A search."""
+    """A search.
+
+    Attributes:
+        parameters: The parameters of the search.
+        results: The results of the search, or `None` if it was not executed yet.
+        relevance_ranks: If the results were re-ranked locally by distance, the
+            position of each result in the order by relevance returned by the API,
+            so that the order can be restored without searching again.
+    """
 
     parameters: SearchParameters
     results: list[places.Place] | None = None
+    relevance_ranks: list[int] | None = None
@@ -3,6 +3,8 @@
 
 """Utility functions for the chatbot."""
 
+from ._cache import AsyncCache, CacheStats
+from ._geo import decode_geohash, encode_geohash, get_distances
 from ._grammar import (
     agree_with_number,
     int_to_ordinal,
@@ -10,18 +12,48 @@ from ._grammar import (
     singularize,
     to_second_singular_person,
 )
-from ._kv_store import KeyValueStore, get_kv_store
+from ._hours import (
+    MINUTES_PER_DAY,
+    MINUTES_PER_WEEK,
+    OpeningHoursIndex,
+    get_open_mask,
+    minute_of_week,
+)
+from ._kv_store import (
+    KeyValueStore,
+    KeyValueStoreStats,
+    MemoryBackend,
+    MissingEntryError,
+    RedisBackend,
+    SQLiteBackend,
+    StorageBackend,
+    StorageStats,
+    create_backend,
+    get_kv_store,
+)
 from ._misc import (
     deserialize,
     deserialize_iterable,
+    deserialize_place,
+    is_place_expired,
     join,
+    memoize_deserialization,
     serialize,
     serialize_iterable,
+    serialize_place,
 )
 from ._parsing import (
+    DucklingClient,
     Instant,
     Interval,
+    ParseResult,
     Time,
+    close_duckling_client,
+    close_duckling_client_on_shutdown,
+    get_duckling_client,
+    get_parsing_cache_stats,
+    memoize_parsing,
+    parse_all,
     parse_numbers,
     parse_ordinals,
     parse_times,
@@ -38,19 +70,44 @@ from ._rasa import (
 from ._search import (
     find_location,
     find_parkings,
+    find_place,
     find_places,
     get_booking_title,
     get_place_title,
+    get_search_cache_stats,
     get_search_title,
     is_place_open,
     is_user_location,
+    iter_places,
     merge_locations,
+    rank_by_distance,
 )
 
 __all__ = [
+    # _cache
+    "AsyncCache",
+    "CacheStats",
+    # _hours
+    "MINUTES_PER_DAY",
+    "MINUTES_PER_WEEK",
+    "OpeningHoursIndex",
+    "get_open_mask",
+    "minute_of_week",
     # _kv_store
     "KeyValueStore",
+    "KeyValueStoreStats",
+    "MemoryBackend",
+    "MissingEntryError",
+    "RedisBackend",
+    "SQLiteBackend",
+    "StorageBackend",
+    "StorageStats",
+    "create_backend",
     "get_kv_store",
+    # _geo
+    "decode_geohash",
+    "encode_geohash",
+    "get_distances",
     # _grammar
     "agree_with_number",
     "int_to_ordinal",
@@ -60,13 +117,25 @@ __all__ = [
     # _misc
     "deserialize",
     "deserialize_iterable",
+    "deserialize_place",
+    "is_place_expired",
     "join",
+    "memoize_deserialization",
     "serialize",
     "serialize_iterable",
+    "serialize_place",
     # _parsing
+    "DucklingClient",
     "Instant",
     "Interval",
+    "ParseResult",
     "Time",
+    "close_duckling_client",
+    "close_duckling_client_on_shutdown",
+    "get_duckling_client",
+    "get_parsing_cache_stats",
+    "memoize_parsing",
+    "parse_all",
     "parse_numbers",
     "parse_ordinals",
     "parse_times",
@@ -81,11 +150,15 @@ __all__ = [
     # _search
     "find_location",
     "find_parkings",
+    "find_place",
     "find_places",
     "get_booking_title",
     "get_place_title",
+    "get_search_cache_stats",
     "get_search_title",
     "is_place_open",
     "is_user_location",
+    "iter_places",
     "merge_locations",
+    "rank_by_distance",
 ]
@@ -0,0 +1,178 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import dataclasses
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Statistics about the usage of a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that were served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
+class _ComputationCancelledError(Exception):
+    """Raised to the tasks waiting for a computation whose task was cancelled."""
+
+
+class AsyncCache(Generic[_K, _V]):
+    """Bounded in-memory cache for the results of coroutines.
+
+    Entries expire after a per-entry time-to-live and, when the cache is full, the
+    least recently used entry is evicted. Concurrent lookups of the same missing key
+    are de-duplicated, so that only the first one runs the coroutine while the others
+    wait for its result.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """Initializes the cache.
+
+        Args:
+            max_size: The maximum number of entries to keep.
+            ttl: The default time-to-live (in seconds) of the entries.
+        """
+        if max_size < 1:
+            msg = "The maximum size of the cache must be at least 1."
+            raise ValueError(msg)
+
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[_K, tuple[float, _V]] = OrderedDict()
+        self._pending: dict[_K, asyncio.Future[_V]] = {}
+        self._stats = CacheStats()
+
+    # ----------------------------------------------------------------------- #
+    # Public methods
+    # ----------------------------------------------------------------------- #
+
+    @property
+    def stats(self) -> CacheStats:
+        """Returns a snapshot of the statistics of the cache."""
+        return dataclasses.replace(self._stats, size=len(self._entries))
+
+    def get(self, key: _K) -> _V | None:
+        """Returns the value associated with the key if it is cached and not expired.
+
+        !!! note
+
+            This method does not update the hit and miss counters.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: _K, value: _V, ttl: float | None = None) -> None:
+        """Stores a value in the cache.
+
+        Args:
+            key: The key of the value.
+            value: The value to store.
+            ttl: The time-to-live (in seconds) of the entry. If `None`, the default
+                time-to-live of the cache is used.
+        """
+        ttl = self._ttl if ttl is None else ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    async def get_or_compute(
+        self,
+        key: _K,
+        compute: Callable[[], Awaitable[_V]],
+        ttl: float | None = None,
+    ) -> _V:
+        """Returns the cached value for the key, computing it if necessary.
+
+        Args:
+            key: The key of the value.
+            compute: The function returning the coroutine that computes the value.
+                It is called only if the key is not cached and no other computation
+                for the same key is in progress.
+            ttl: The time-to-live (in seconds) of the new entry. If `None`, the
+                default time-to-live of the cache is used.
+
+        Returns:
+            The value associated with the key.
+
+        Raises:
+            Exception: Any exception raised by the computation of the value. If the
+                task computing the value is cancelled, the tasks waiting for the same
+                key are not: one of them computes the value instead.
+        """
+        while True:
+            value = self.get(key)
+            if value is not None:
+                self._stats.hits += 1
+                return value
+
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+
+            try:
+                value = await asyncio.shield(pending)
+            except _ComputationCancelledError:
+                # the task computing the value was cancelled, so one of the waiting
+                # tasks takes over the computation
+                continue
+
+            self._stats.hits += 1
+            return value
+
+        self._stats.misses += 1
+        future: asyncio.Future[_V] = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            # the cancellation concerns only the current task, the waiting ones
+            # must not be aborted
+            future.set_exception(_ComputationCancelledError())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # avoid "exception was never retrieved" warnings if nobody is waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            self.put(key, value, ttl)
+            return value
+        finally:
+            del self._pending[key]
+
+    def clear(self) -> None:
+        """Removes all the entries from the cache."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,110 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+from gcp.maps import places
+
+_EARTH_RADIUS = 6_371_008.8  # mean radius in meters
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def get_distances(
+    origin: places.LatLng,
+    locations: Sequence[places.LatLng],
+) -> npt.NDArray[np.float64]:
+    """Computes the great-circle distances from a point to many locations.
+
+    The distances are computed with the haversine formula on all the locations at
+    once, so they are slightly less accurate than the geodesic distances computed
+    by `geopy` but much faster to obtain for many locations.
+
+    Args:
+        origin: The point from which the distances are computed.
+        locations: The locations to compute the distances to.
+
+    Returns:
+        The distances in meters, in the same order of the locations.
+    """
+    lat0, lng0 = np.radians(tuple(origin)[:2])
+    coords = np.radians(np.array([tuple(loc)[:2] for loc in locations], dtype=float))
+    if len(coords) == 0:
+        return np.zeros(0)
+
+    lat, lng = coords[:, 0], coords[:, 1]
+    a = (
+        np.sin((lat - lat0) / 2) ** 2
+        + np.cos(lat0) * np.cos(lat) * np.sin((lng - lng0) / 2) ** 2
+    )
+    return 2 * _EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int) -> str:
+    """Returns the geohash of the cell containing a point.
+
+    Args:
+        latitude: The latitude of the point.
+        longitude: The longitude of the point.
+        precision: The number of characters of the geohash. Each additional
+            character makes the cell 4 to 8 times smaller (e.g. the cells of
+            precision 7 are about 150 x 150 meters).
+
+    Returns:
+        The geohash.
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        # the bits alternate between longitude and latitude, starting from the
+        # longitude
+        value, interval = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+
+    return "".join(chars)
+
+
+def decode_geohash(geohash: str) -> tuple[tuple[float, float], float]:
+    """Returns the center of a geohash cell and the radius of the circle covering it.
+
+    Args:
+        geohash: The geohash of the cell.
+
+    Returns:
+        The latitude and longitude of the center of the cell, and the distance (in
+        meters) from the center to the farthest corner of the cell.
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = _GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            interval = lng_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if (bits >> shift) & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+
+    center = ((lat_range[0] + lat_range[1]) / 2, (lng_range[0] + lng_range[1]) / 2)
+    # the corner closer to the equator is the farthest from the center
+    corner_lat = min(lat_range, key=abs)
+    radius = get_distances(center, [(corner_lat, lng_range[0])])[0]  # type: ignore
+    return center, float(radius)
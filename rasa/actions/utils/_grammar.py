@@ -1,8 +1,24 @@
 # Copyright 2024 Francesco Gentile.
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
+
 import inflect
 
+# the number of words whose singular and plural forms are memoized
+_CACHE_SIZE = 1024
+
+
+@functools.cache
+def _get_engine() -> inflect.engine:
+    """Returns the shared inflect engine.
+
+    Creating an engine is expensive, so a single one is reused. The engine is not
+    stateful as long as its user-defined words and classical settings are not
+    changed, which we never do.
+    """
+    return inflect.engine()
+
 
 def agree_with_number(word: str, count: int) -> str:
     """Agrees a word with a number.
@@ -28,6 +44,7 @@ def agree_with_number(word: str, count: int) -> str:
     return singularize(word) if count == 1 else pluralize(word)
 
 
+@functools.lru_cache(maxsize=_CACHE_SIZE)
 def singularize(word: str) -> str:
     """Returns the singular form of a word.
 
@@ -35,13 +52,14 @@ def singularize(word: str) -> str:
 
         If the word is already singular, the same word will be returned.
     """
-    engine = inflect.engine()
+    engine = _get_engine()
     singular = engine.singular_noun(word)  # type: ignore
     if singular is False:
         return word
     return singular
 
 
+@functools.lru_cache(maxsize=_CACHE_SIZE)
 def pluralize(word: str) -> str:
     """Returns the plural form of a word.
 
@@ -49,7 +67,7 @@ def pluralize(word: str) -> str:
 
         If the word is already plural, the same word will be returned.
     """
-    engine = inflect.engine()
+    engine = _get_engine()
     # singular_noun returns False if the word is already singular
     # otherwise it returns the singular form
     singular = engine.singular_noun(word)  # type: ignore
@@ -0,0 +1,300 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+import bisect
+import math
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import numpy.typing as npt
+from gcp.maps import places
+
+# --------------------------------------------------------------------------- #
+# Constants
+# --------------------------------------------------------------------------- #
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+_INDEX_CACHE_SIZE = 4096
+# the queries start in the second copy of the week and last at most one week
+_NUM_WEEKS = 3
+# a boundary that is never reached by the minute-of-week of a query
+_SENTINEL = _NUM_WEEKS * MINUTES_PER_WEEK
+
+_Period = tuple[time | None, time | None]
+_index_cache: OrderedDict[tuple[tuple[_Period, ...], ...], "OpeningHoursIndex"] = (
+    OrderedDict()
+)
+
+# --------------------------------------------------------------------------- #
+# Index
+# --------------------------------------------------------------------------- #
+
+
+class OpeningHoursIndex:
+    """Weekly index of the opening hours of a place.
+
+    The intervals in which the place is open are merged and stored as a sorted list
+    of minute-of-week boundaries, where the even positions open an interval and the
+    odd positions close it. This way, all the queries are answered by a binary
+    search. The week is repeated three times and the queries start in the second
+    copy, so that the intervals that cross midnight between Sunday and Monday and
+    the queries spanning the end of the week do not need any special handling.
+    """
+
+    def __init__(self, periods: Sequence[Sequence[_Period]]) -> None:
+        """Initializes the index.
+
+        Args:
+            periods: For each day of the week (starting from Monday), the periods in
+                which the place is open. A period starting at `None` continues from
+                the previous day, while a period ending at `None` continues into the
+                following day.
+        """
+        intervals = []
+        for wd, day_periods in enumerate(periods):
+            offset = wd * MINUTES_PER_DAY
+            for s, e in day_periods:
+                start = offset + (_to_minutes(s) if s is not None else 0)
+                end = offset + (_to_minutes(e) if e is not None else MINUTES_PER_DAY)
+                if e is not None and s is not None and end < start:
+                    # the period closes after midnight
+                    end += MINUTES_PER_DAY
+                if end > start:
+                    intervals.append((start, end))
+
+        intervals.sort()
+        boundaries: list[int] = []
+        for week in range(_NUM_WEEKS):
+            for start, end in intervals:
+                start += week * MINUTES_PER_WEEK  # noqa: PLW2901
+                end += week * MINUTES_PER_WEEK  # noqa: PLW2901
+                if boundaries and start <= boundaries[-1]:
+                    boundaries[-1] = max(boundaries[-1], end)
+                else:
+                    boundaries.extend((start, end))
+
+        self._boundaries = boundaries
+
+    # ----------------------------------------------------------------------- #
+    # Factory methods
+    # ----------------------------------------------------------------------- #
+
+    @classmethod
+    def from_place(cls, place: places.Place) -> "OpeningHoursIndex":
+        """Returns the index of the opening hours of a place.
+
+        The indexes are cached by the opening hours they are built from, so that
+        the same place is indexed only once even if it is deserialized many times.
+
+        Raises:
+            ValueError: If the place does not have regular opening hours.
+        """
+        if place.regular_opening_hours is None:
+            msg = "The place does not have regular opening hours."
+            raise ValueError(msg)
+
+        key = tuple(tuple(day) for day in place.regular_opening_hours.periods)
+        index = _index_cache.get(key)
+        if index is None:
+            index = cls(place.regular_opening_hours.periods)
+            _index_cache[key] = index
+            if len(_index_cache) > _INDEX_CACHE_SIZE:
+                _index_cache.popitem(last=False)
+        else:
+            _index_cache.move_to_end(key)
+
+        return index
+
+    # ----------------------------------------------------------------------- #
+    # Properties
+    # ----------------------------------------------------------------------- #
+
+    @property
+    def boundaries(self) -> list[int]:
+        """The minute-of-week boundaries of the intervals in which the place is open.
+
+        The even positions open an interval and the odd positions close it. The
+        boundaries cover three consecutive weeks.
+        """
+        return self._boundaries.copy()
+
+    # ----------------------------------------------------------------------- #
+    # Queries
+    # ----------------------------------------------------------------------- #
+
+    def is_open_at(self, dt: datetime) -> bool:
+        """Checks if the place is open at the given time."""
+        minute = MINUTES_PER_WEEK + minute_of_week(dt)
+        idx = bisect.bisect_right(self._boundaries, minute)
+        return idx % 2 == 1
+
+    def is_open_during(self, start: datetime, end: datetime) -> bool:
+        """Checks if the place is open for the whole interval `[start, end)`."""
+        if end <= start:
+            return self.is_open_at(start)
+
+        minute = MINUTES_PER_WEEK + minute_of_week(start)
+        duration = math.ceil((end - start) / timedelta(minutes=1))
+        if duration > MINUTES_PER_WEEK:
+            return self._boundaries == [0, _SENTINEL]
+
+        idx = bisect.bisect_right(self._boundaries, minute)
+        return idx % 2 == 1 and self._boundaries[idx] >= minute + duration
+
+    def get_open_intervals(
+        self,
+        start: datetime,
+        end: datetime,
+    ) -> list[tuple[datetime, datetime]]:
+        """Returns the intervals in which the place is open between two times.
+
+        Args:
+            start: The start of the time window.
+            end: The end of the time window (at most one week after the start).
+
+        Returns:
+            The intervals, clipped to the time window and sorted by start time.
+        """
+        if end <= start:
+            return []
+
+        base = start.replace(second=0, microsecond=0)
+        first = MINUTES_PER_WEEK + minute_of_week(start)
+        last = first + math.ceil((end - base) / timedelta(minutes=1))
+        last = min(last, first + MINUTES_PER_WEEK)
+
+        intervals = []
+        idx = bisect.bisect_right(self._boundaries, first)
+        if idx % 2 == 1:
+            # the place is already open at the start of the window
+            idx -= 1
+        while idx < len(self._boundaries) and self._boundaries[idx] < last:
+            s = max(self._boundaries[idx], first)
+            e = min(self._boundaries[idx + 1], last)
+            intervals.append((
+                max(base + timedelta(minutes=s - first), start),
+                min(base + timedelta(minutes=e - first), end),
+            ))
+            idx += 2
+
+        return intervals
+
+    def get_next_opening(self, dt: datetime) -> datetime | None:
+        """Returns the first time, not before the given one, the place is open.
+
+        Returns:
+            The given time if the place is open, the time it opens otherwise, or
+            `None` if the place is never open.
+        """
+        minute = MINUTES_PER_WEEK + minute_of_week(dt)
+        idx = bisect.bisect_right(self._boundaries, minute)
+        if idx % 2 == 1:
+            return dt
+        if idx == len(self._boundaries):
+            return None
+
+        base = dt.replace(second=0, microsecond=0)
+        return base + timedelta(minutes=self._boundaries[idx] - minute)
+
+    def get_day_periods(self, wd: int) -> list[_Period]:
+        """Returns the periods in which the place is open during a day of the week.
+
+        Args:
+            wd: The day of the week (0 is Monday).
+
+        Returns:
+            The periods, in the same format used by the Places API: a period starting
+            at `None` continues from the previous day, while a period ending at
+            `None` continues into the following day.
+        """
+        # the second week is used so that the intervals starting on the previous
+        # Sunday are already merged
+        day_start = MINUTES_PER_WEEK + wd * MINUTES_PER_DAY
+        day_end = day_start + MINUTES_PER_DAY
+
+        periods = []
+        idx = bisect.bisect_right(self._boundaries, day_start)
+        if idx % 2 == 1:
+            idx -= 1
+        while idx < len(self._boundaries) and self._boundaries[idx] < day_end:
+            s, e = self._boundaries[idx], self._boundaries[idx + 1]
+            periods.append((
+                _to_time(s - day_start) if s >= day_start else None,
+                _to_time(e - day_start) if e < day_end else None,
+            ))
+            idx += 2
+
+        return periods
+
+
+# --------------------------------------------------------------------------- #
+# Batched queries
+# --------------------------------------------------------------------------- #
+
+
+def get_open_mask(
+    places_: Sequence[places.Place],
+    start: datetime,
+    end: datetime,
+) -> npt.NDArray[np.bool_]:
+    """Checks which places are open for the whole interval `[start, end)`.
+
+    The boundaries of the opening hours of all the places are packed into a single
+    matrix (padded with a sentinel that is never reached), so that the places are
+    checked together with a few vectorized operations instead of one query each.
+
+    Args:
+        places_: The places to check. Places without regular opening hours are
+            considered closed.
+        start: The start of the interval.
+        end: The end of the interval. If it is not after the start, the places are
+            checked at the start time only.
+
+    Returns:
+        A boolean array with, for each place, whether it is open.
+    """
+    rows = [
+        OpeningHoursIndex.from_place(place).boundaries
+        if place.regular_opening_hours is not None
+        else []
+        for place in places_
+    ]
+    # one extra column, so that the boundary following the last one always exists
+    width = max((len(row) for row in rows), default=0) + 1
+    boundaries = np.full((len(rows), width), _SENTINEL, dtype=np.int32)
+    for idx, row in enumerate(rows):
+        boundaries[idx, : len(row)] = row
+
+    minute = MINUTES_PER_WEEK + minute_of_week(start)
+    duration = max(math.ceil((end - start) / timedelta(minutes=1)), 1)
+    if duration > MINUTES_PER_WEEK:
+        # only the places that are always open
+        return (boundaries[:, 0] == 0) & (boundaries[:, 1] == _SENTINEL)
+
+    # the number of boundaries not after the start is odd if the place is open
+    counts = (boundaries <= minute).sum(axis=1)
+    is_open = counts % 2 == 1
+    closes_at = np.take_along_axis(boundaries, counts[:, None], axis=1)[:, 0]
+    return is_open & (closes_at >= minute + duration)
+
+
+# --------------------------------------------------------------------------- #
+# Utilities
+# --------------------------------------------------------------------------- #
+
+
+def minute_of_week(dt: datetime) -> int:
+    """Returns the number of minutes elapsed since the start of the week."""
+    return dt.weekday() * MINUTES_PER_DAY + dt.hour * 60 + dt.minute
+
+
+def _to_minutes(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+def _to_time(minutes: int) -> time:
+    return time(minutes // 60, minutes % 60)
@@ -1,17 +1,538 @@
 # Copyright 2024 Francesco Gentile.
 # SPDX-License-Identifier: Apache-2.0
 
+import abc
+import dataclasses
+import hashlib
+import math
+import os
+import pickle
+import sqlite3
+import time
 import uuid
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+from urllib.parse import parse_qsl, urlparse
+
+from gcp.maps import places
 
 from actions.records import BookingData, SearchData
 
+_KV_STORE_URL_ENV_VAR = "KV_STORE_URL"
+_DEFAULT_KV_STORE_URL = "memory://"
+_SEARCH_PREFIX = "search:"
+_BOOKING_PREFIX = "booking:"
+_PLACE_PREFIX = "place:"
+# entries not accessed for a week belong to abandoned conversations
+_DEFAULT_TTL = 7 * 24 * 60 * 60
+_DEFAULT_MAX_ENTRIES = 10_000
+
+# --------------------------------------------------------------------------- #
+# Storage backends
+# --------------------------------------------------------------------------- #
+
+
+@dataclasses.dataclass(frozen=True)
+class StorageStats:
+    """Statistics about the objects kept by a storage."""
+
+    num_entries: int
+    approx_bytes: int
+
+
+class StorageBackend(abc.ABC):
+    """Interface of the storages used by the key-value store.
+
+    Entries not accessed for longer than the time-to-live of the backend (if any)
+    are considered expired and behave as if they were deleted.
+    """
+
+    @abc.abstractmethod
+    def get_many(self, keys: Sequence[str]) -> list[Any | None]:
+        """Returns the values associated with the keys.
+
+        Reading an entry refreshes its time-to-live.
+
+        Args:
+            keys: The keys of the values to retrieve.
+
+        Returns:
+            The values associated with the keys, in the same order. Missing keys are
+            mapped to `None`.
+        """
+
+    @abc.abstractmethod
+    def put_many(self, items: Mapping[str, Any]) -> None:
+        """Stores the given values, overwriting existing ones.
+
+        Args:
+            items: The values to store indexed by their key.
+        """
+
+    @abc.abstractmethod
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Deletes the values associated with the keys.
+
+        Args:
+            keys: The keys of the values to delete. Missing keys are ignored.
+
+        Returns:
+            The number of deleted values.
+        """
+
+    @abc.abstractmethod
+    def contains(self, key: str) -> bool:
+        """Checks whether a value is associated with the key."""
+
+    @abc.abstractmethod
+    def stats(self, prefix: str = "") -> StorageStats:
+        """Returns statistics about the entries whose key starts with the prefix."""
+
+    def close(self) -> None:  # noqa: B027
+        """Releases the resources held by the backend.
+
+        The default implementation does nothing, since not all the backends hold
+        resources that need to be released.
+        """
+
+
+class MemoryBackend(StorageBackend):
+    """Storage keeping the objects in the memory of the current process.
+
+    When the number of entries or their approximate size exceed the given limits,
+    the least recently used entries are evicted.
+
+    !!! note
+
+        Since the objects are not shared, this backend can be used only when the
+        action server runs in a single process.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Initializes the backend.
+
+        Args:
+            ttl: The number of seconds after which an entry that has not been
+                accessed expires. If `None`, entries never expire.
+            max_entries: The maximum number of entries to keep. If `None`, the number
+                of entries is not bounded.
+            max_bytes: The maximum approximate size (in bytes) of the entries. The
+                size of an entry is estimated as the length of its pickled form, so
+                setting this limit makes storing the entries slower. If `None`, the
+                size is not bounded and it is estimated only to compute statistics.
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        # key -> (expiration time, approximate size, value), ordered by last access
+        self._data: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._num_bytes = 0
+
+    def get_many(self, keys: Sequence[str]) -> list[Any | None]:
+        now = time.monotonic()
+        values = []
+        for key in keys:
+            entry = self._data.get(key)
+            if entry is None:
+                values.append(None)
+                continue
+
+            expires_at, size, value = entry
+            if expires_at <= now:
+                self._remove(key)
+                values.append(None)
+                continue
+
+            self._data[key] = (self._expiration(now), size, value)
+            self._data.move_to_end(key)
+            values.append(value)
+
+        return values
+
+    def put_many(self, items: Mapping[str, Any]) -> None:
+        now = time.monotonic()
+        for key, value in items.items():
+            self._remove(key)
+            # the size is needed only to bound the memory used by the entries
+            size = _get_size(value) if self._max_bytes is not None else 0
+            self._data[key] = (self._expiration(now), size, value)
+            self._num_bytes += size
+
+        self._evict(now)
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        return sum(self._remove(key) for key in keys)
+
+    def contains(self, key: str) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def stats(self, prefix: str = "") -> StorageStats:
+        self._evict(time.monotonic())
+        entries = [
+            size if self._max_bytes is not None else _get_size(value)
+            for key, (_, size, value) in self._data.items()
+            if key.startswith(prefix)
+        ]
+        return StorageStats(len(entries), sum(entries))
+
+    def _expiration(self, now: float) -> float:
+        return now + self._ttl if self._ttl is not None else math.inf
+
+    def _remove(self, key: str) -> bool:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+
+        self._num_bytes -= entry[1]
+        return True
+
+    def _evict(self, now: float) -> None:
+        # since the entries are ordered by last access and all of them share the
+        # same ttl, the expired entries are at the beginning
+        while self._data:
+            key, (expires_at, _, _) = next(iter(self._data.items()))
+            over_entries = (
+                self._max_entries is not None and len(self._data) > self._max_entries
+            )
+            over_bytes = (
+                self._max_bytes is not None and self._num_bytes > self._max_bytes
+            )
+            if expires_at > now and not over_entries and not over_bytes:
+                break
+
+            self._remove(key)
+
+
+class SQLiteBackend(StorageBackend):
+    """Storage persisting the objects in a SQLite database.
+
+    The database is opened in WAL mode, so that multiple workers running on the same
+    machine can read and write it concurrently. When the number of entries exceeds
+    the given limit, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        """Initializes the backend.
+
+        Args:
+            path: The path to the database file. It is created if it does not exist.
+            ttl: The number of seconds after which an entry that has not been
+                accessed expires. If `None`, entries never expire.
+            max_entries: The maximum number of entries to keep. If `None`, the number
+                of entries is not bounded.
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv_store ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, accessed_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS kv_store_accessed_at ON kv_store (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Sequence[str]) -> list[Any | None]:
+        if len(keys) == 0:
+            return []
+
+        now = time.time()
+        placeholders = ", ".join("?" for _ in keys)
+        with self._conn:
+            rows = self._conn.execute(
+                f"SELECT key, value FROM kv_store WHERE key IN ({placeholders}) "  # noqa: S608
+                "AND accessed_at > ?",
+                [*keys, self._expiration_threshold(now)],
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE kv_store SET accessed_at = ? WHERE key = ?",
+                [(now, key) for key, _ in rows],
+            )
+
+        values = {key: _decode(value) for key, value in rows}
+        return [values.get(key) for key in keys]
+
+    def put_many(self, items: Mapping[str, Any]) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO kv_store (key, value, accessed_at) "
+                "VALUES (?, ?, ?)",
+                [(key, _encode(value), now) for key, value in items.items()],
+            )
+            self._evict(now)
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        with self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM kv_store WHERE key = ?",
+                [(key,) for key in keys],
+            )
+        return cursor.rowcount
+
+    def contains(self, key: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM kv_store WHERE key = ? AND accessed_at > ?",
+            (key, self._expiration_threshold(time.time())),
+        ).fetchone()
+        return row is not None
+
+    def stats(self, prefix: str = "") -> StorageStats:
+        with self._conn:
+            self._evict(time.time())
+            # keys never contain the LIKE wildcards, so the prefix needs no escaping
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM kv_store "
+                "WHERE key LIKE ?",
+                (prefix + "%",),
+            ).fetchone()
+        return StorageStats(count, size)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _expiration_threshold(self, now: float) -> float:
+        return now - self._ttl if self._ttl is not None else -math.inf
+
+    def _evict(self, now: float) -> None:
+        if self._ttl is not None:
+            self._conn.execute(
+                "DELETE FROM kv_store WHERE accessed_at <= ?",
+                (self._expiration_threshold(now),),
+            )
+        if self._max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM kv_store WHERE key IN ("
+                "SELECT key FROM kv_store ORDER BY accessed_at DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self._max_entries,),
+            )
+
+
+class RedisBackend(StorageBackend):
+    """Storage persisting the objects in a server speaking the Redis protocol.
+
+    Expiration is delegated to the server. To bound the memory used by the
+    entries, configure the `maxmemory` and `maxmemory-policy` (e.g. `allkeys-lru`)
+    options of the server.
+
+    !!! note
+
+        This backend requires the `redis` package. Any client exposing the same
+        synchronous interface (e.g. `fakeredis.FakeRedis`) can be used as well.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        prefix: str = "dine-smart:",
+        ttl: float | None = None,
+    ) -> None:
+        """Initializes the backend.
+
+        Args:
+            client: The Redis client.
+            prefix: The prefix prepended to all keys, so that the same database can
+                be shared with other applications.
+            ttl: The number of seconds after which an entry that has not been
+                accessed expires. If `None`, entries never expire.
+        """
+        self._client = client
+        self._prefix = prefix
+        self._ttl = math.ceil(ttl) if ttl is not None else None
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        prefix: str = "dine-smart:",
+        ttl: float | None = None,
+    ) -> "RedisBackend":
+        """Creates a backend connected to the server at the given URL."""
+        try:
+            import redis  # noqa: PLC0415
+        except ImportError as e:
+            msg = "The 'redis' package is required to use the Redis storage backend."
+            raise RuntimeError(msg) from e
+
+        return cls(redis.Redis.from_url(url), prefix, ttl)
+
+    def get_many(self, keys: Sequence[str]) -> list[Any | None]:
+        if len(keys) == 0:
+            return []
+
+        keys = [self._prefix + key for key in keys]
+        values = self._client.mget(keys)
+        if self._ttl is not None:
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in zip(keys, values, strict=True):
+                if value is not None:
+                    pipe.expire(key, self._ttl)
+            pipe.execute()
+
+        return [_decode(value) if value is not None else None for value in values]
+
+    def put_many(self, items: Mapping[str, Any]) -> None:
+        if len(items) == 0:
+            return
+
+        pipe = self._client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self._prefix + key, _encode(value), ex=self._ttl)
+        pipe.execute()
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        keys = [self._prefix + key for key in keys]
+        if len(keys) == 0:
+            return 0
+
+        return self._client.delete(*keys)
+
+    def contains(self, key: str) -> bool:
+        return bool(self._client.exists(self._prefix + key))
+
+    def stats(self, prefix: str = "") -> StorageStats:
+        keys = list(self._client.scan_iter(match=f"{self._prefix}{prefix}*"))
+        pipe = self._client.pipeline(transaction=False)
+        for key in keys:
+            pipe.strlen(key)
+        return StorageStats(len(keys), sum(pipe.execute()))
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def create_backend(url: str) -> StorageBackend:
+    """Creates the storage backend described by the given URL.
+
+    The supported URLs are:
+    - `memory://` for the in-memory backend;
+    - `sqlite:///relative/path.db` or `sqlite:////absolute/path.db` for the SQLite
+      backend;
+    - `redis://host:port/db` (or `rediss://`) for the Redis backend.
+
+    The limits of the backend can be set with the `ttl` (in seconds),
+    `max_entries` and `max_bytes` query parameters (e.g.
+    `memory://?ttl=3600&max_bytes=1000000`). Not all backends support all the
+    limits. If no `ttl` is given, entries expire after a week without accesses.
+    Use `ttl=none` to disable expiration. The in-memory backend keeps at most
+    10000 entries unless `max_entries` is given.
+
+    Args:
+        url: The URL of the storage.
+
+    Returns:
+        The storage backend.
+
+    Raises:
+        ValueError: If the scheme of the URL is not supported or if a limit is not
+            supported by the backend.
+    """
+    parsed = urlparse(url)
+    params = dict(parse_qsl(parsed.query))
+    ttl = params.pop("ttl", None)
+    ttl = _DEFAULT_TTL if ttl is None else None if ttl == "none" else float(ttl)
+
+    match parsed.scheme:
+        case "memory":
+            backend = MemoryBackend(
+                ttl=ttl,
+                max_entries=_pop_int(params, "max_entries", _DEFAULT_MAX_ENTRIES),
+                max_bytes=_pop_int(params, "max_bytes"),
+            )
+        case "sqlite":
+            backend = SQLiteBackend(
+                parsed.path.removeprefix("/"),
+                ttl=ttl,
+                max_entries=_pop_int(params, "max_entries"),
+            )
+        case "redis" | "rediss":
+            url = parsed._replace(query="").geturl()
+            backend = RedisBackend.from_url(url, ttl=ttl)
+        case _:
+            msg = f"Unsupported key-value store URL '{url}'."
+            raise ValueError(msg)
+
+    if params:
+        msg = f"Unsupported key-value store parameters: {', '.join(params)}."
+        raise ValueError(msg)
+
+    return backend
+
+
+def _pop_int(
+    params: dict[str, str],
+    name: str,
+    default: int | None = None,
+) -> int | None:
+    value = params.pop(name, None)
+    return int(value) if value is not None else default
+
+
+def _get_size(value: Any) -> int:
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _encode(value: Any) -> bytes:
+    return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def _decode(data: bytes) -> Any:
+    return pickle.loads(zlib.decompress(data))  # noqa: S301
+
+
+# --------------------------------------------------------------------------- #
+# Key-value store
+# --------------------------------------------------------------------------- #
+
+
+class MissingEntryError(KeyError):
+    """Raised when an entry is not in the key-value store.
+
+    Since the entries are evicted when they expire or when the store is full, the
+    keys kept in the slots of a conversation may no longer exist.
+    """
+
+
+@dataclasses.dataclass(frozen=True)
+class KeyValueStoreStats:
+    """Statistics about the objects kept by the key-value store."""
+
+    num_searches: int
+    num_bookings: int
+    num_places: int
+    approx_bytes: int
+
 
 class KeyValueStore:
-    """In-memory key-value store."""
+    """Key-value store for the searches, bookings and places of the users."""
+
+    def __init__(self, backend: StorageBackend | None = None) -> None:
+        """Initializes the store.
 
-    def __init__(self) -> None:
-        self._search_store: dict[str, SearchData] = {}
-        self._booking_store: dict[str, BookingData] = {}
+        Args:
+            backend: The storage where the objects are kept. If `None`, the objects
+                are kept in memory.
+        """
+        self._backend = backend if backend is not None else MemoryBackend()
 
     # ----------------------------------------------------------------------- #
     # Public methods
@@ -26,13 +547,7 @@ class KeyValueStore:
         Returns:
             The key under which the booking is stored.
         """
-        while True:
-            key = str(uuid.uuid4())
-            if key not in self._booking_store:
-                break
-
-        self._booking_store[key] = booking
-        return key
+        return self._add(_BOOKING_PREFIX, booking)
 
     def add_search(self, search: SearchData) -> str:
         """Adds a search to the store and returns the key.
@@ -43,12 +558,34 @@ class KeyValueStore:
         Returns:
             The key under which the search is stored.
         """
-        while True:
-            key = str(uuid.uuid4())
-            if key not in self._search_store:
-                break
+        return self._add(_SEARCH_PREFIX, search)
+
+    def add_place(self, place: places.Place, key: str | None = None) -> str:
+        """Adds a place to the store and returns the key.
+
+        The key is derived from the name, address and coordinates of the place, so
+        that adding the same place multiple times returns the same key and does not
+        duplicate the entry (a newer version of the place replaces the older one).
+        Since the same entry may be referenced by many slots, places are never
+        deleted explicitly and are left to the eviction of the backend.
+
+        Args:
+            place: The place to store.
+            key: The key under which to store the place. If `None`, the key is
+                derived from the place. This is used to store again a place that
+                was evicted under the key still referenced by a slot.
 
-        self._search_store[key] = search
+        Returns:
+            The key under which the place is stored.
+        """
+        if key is None:
+            # only the identifying fields are hashed, so that the place is not
+            # pickled both here and by the backend
+            name = place.display_name.text if place.display_name else None
+            data = f"{name}|{place.short_formatted_address}|{place.location!r}"
+            key = hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+        self._backend.put_many({_PLACE_PREFIX + key: place})
         return key
 
     def update_booking(self, key: str, booking: BookingData) -> None:
@@ -59,12 +596,9 @@ class KeyValueStore:
             booking: The new booking.
 
         Raises:
-            KeyError: If the key does not exist.
+            MissingEntryError: If the key does not exist.
         """
-        if key not in self._booking_store:
-            raise KeyError(key)
-
-        self._booking_store[key] = booking
+        self._update(_BOOKING_PREFIX, key, booking)
 
     def update_search(self, key: str, search: SearchData) -> None:
         """Updates the search of an existing key.
@@ -74,12 +608,9 @@ class KeyValueStore:
             search: The new search.
 
         Raises:
-            KeyError: If the key does not exist.
+            MissingEntryError: If the key does not exist.
         """
-        if key not in self._search_store:
-            raise KeyError(key)
-
-        self._search_store[key] = search
+        self._update(_SEARCH_PREFIX, key, search)
 
     def get_booking(self, key: str) -> BookingData:
         """Returns the booking associated with the key.
@@ -91,9 +622,23 @@ class KeyValueStore:
             The booking associated with the key.
 
         Raises:
-            KeyError: If the key does not exist.
+            MissingEntryError: If the key does not exist.
         """
-        return self._booking_store[key]
+        return self._get_many(_BOOKING_PREFIX, [key])[0]
+
+    def get_bookings(self, keys: Sequence[str]) -> list[BookingData]:
+        """Returns the bookings associated with the keys.
+
+        Args:
+            keys: The keys of the bookings to retrieve.
+
+        Returns:
+            The bookings associated with the keys, in the same order.
+
+        Raises:
+            MissingEntryError: If any of the keys does not exist.
+        """
+        return self._get_many(_BOOKING_PREFIX, keys)
 
     def get_search(self, key: str) -> SearchData:
         """Returns the search associated with the key.
@@ -105,9 +650,49 @@ class KeyValueStore:
             The search associated with the key.
 
         Raises:
-            KeyError: If the key does not exist.
+            MissingEntryError: If the key does not exist.
+        """
+        return self._get_many(_SEARCH_PREFIX, [key])[0]
+
+    def get_searches(self, keys: Sequence[str]) -> list[SearchData]:
+        """Returns the searches associated with the keys.
+
+        Args:
+            keys: The keys of the searches to retrieve.
+
+        Returns:
+            The searches associated with the keys, in the same order.
+
+        Raises:
+            MissingEntryError: If any of the keys does not exist.
         """
-        return self._search_store[key]
+        return self._get_many(_SEARCH_PREFIX, keys)
+
+    def get_place(self, key: str) -> places.Place:
+        """Returns the place associated with the key.
+
+        Args:
+            key: The key of the place to retrieve.
+
+        Returns:
+            The place associated with the key.
+
+        Raises:
+            MissingEntryError: If the key does not exist.
+        """
+        return self._get_many(_PLACE_PREFIX, [key])[0]
+
+    def contains_booking(self, key: str) -> bool:
+        """Checks whether a booking is associated with the key."""
+        return self._backend.contains(_BOOKING_PREFIX + key)
+
+    def contains_search(self, key: str) -> bool:
+        """Checks whether a search is associated with the key."""
+        return self._backend.contains(_SEARCH_PREFIX + key)
+
+    def contains_place(self, key: str) -> bool:
+        """Checks whether a place is associated with the key."""
+        return self._backend.contains(_PLACE_PREFIX + key)
 
     def delete_booking(self, key: str) -> None:
         """Deletes the booking associated with the key.
@@ -116,9 +701,10 @@ class KeyValueStore:
             key: The key of the booking to delete.
 
         Raises:
-            KeyError: If the key does not exist.
+            MissingEntryError: If the key does not exist.
         """
-        del self._booking_store[key]
+        if self._backend.delete_many([_BOOKING_PREFIX + key]) == 0:
+            raise MissingEntryError(key)
 
     def delete_search(self, key: str) -> None:
         """Deletes the search associated with the key.
@@ -127,19 +713,93 @@ class KeyValueStore:
             key: The key of the search to delete.
 
         Raises:
-            KeyError: If the key does not exist.
+            MissingEntryError: If the key does not exist.
         """
-        del self._search_store[key]
+        if self._backend.delete_many([_SEARCH_PREFIX + key]) == 0:
+            raise MissingEntryError(key)
+
+    def delete_bookings(self, keys: Iterable[str | None]) -> int:
+        """Deletes the bookings associated with the keys.
+
+        Args:
+            keys: The keys of the bookings to delete. `None` values and keys that do
+                not exist (e.g. because they expired) are ignored.
+
+        Returns:
+            The number of deleted bookings.
+        """
+        keys = [_BOOKING_PREFIX + key for key in keys if key is not None]
+        return self._backend.delete_many(keys)
+
+    def delete_searches(self, keys: Iterable[str | None]) -> int:
+        """Deletes the searches associated with the keys.
+
+        Args:
+            keys: The keys of the searches to delete. `None` values and keys that do
+                not exist (e.g. because they expired) are ignored.
+
+        Returns:
+            The number of deleted searches.
+        """
+        keys = [_SEARCH_PREFIX + key for key in keys if key is not None]
+        return self._backend.delete_many(keys)
+
+    def stats(self) -> KeyValueStoreStats:
+        """Returns statistics about the objects kept by the store."""
+        searches = self._backend.stats(_SEARCH_PREFIX)
+        bookings = self._backend.stats(_BOOKING_PREFIX)
+        places_ = self._backend.stats(_PLACE_PREFIX)
+        return KeyValueStoreStats(
+            num_searches=searches.num_entries,
+            num_bookings=bookings.num_entries,
+            num_places=places_.num_entries,
+            approx_bytes=(
+                searches.approx_bytes + bookings.approx_bytes + places_.approx_bytes
+            ),
+        )
+
+    # ----------------------------------------------------------------------- #
+    # Private methods
+    # ----------------------------------------------------------------------- #
+
+    def _add(self, prefix: str, value: Any) -> str:
+        while True:
+            key = str(uuid.uuid4())
+            if not self._backend.contains(prefix + key):
+                break
+
+        self._backend.put_many({prefix + key: value})
+        return key
+
+    def _update(self, prefix: str, key: str, value: Any) -> None:
+        if not self._backend.contains(prefix + key):
+            raise MissingEntryError(key)
+
+        self._backend.put_many({prefix + key: value})
+
+    def _get_many(self, prefix: str, keys: Sequence[str]) -> list[Any]:
+        values = self._backend.get_many([prefix + key for key in keys])
+        for key, value in zip(keys, values, strict=True):
+            if value is None:
+                raise MissingEntryError(key)
+
+        return values
 
 
 _store: KeyValueStore | None = None
 
 
 def get_kv_store() -> KeyValueStore:
-    """Returns the global key-value store."""
+    """Returns the global key-value store.
+
+    The storage backend is selected through the `KV_STORE_URL` environment variable
+    (see `create_backend` for the supported URLs). If the variable is not set, the
+    objects are kept in memory.
+    """
     global _store  # noqa: PLW0603
 
     if _store is None:
-        _store = KeyValueStore()
+        url = os.environ.get(_KV_STORE_URL_ENV_VAR, _DEFAULT_KV_STORE_URL)
+        _store = KeyValueStore(create_backend(url))
 
     return _store
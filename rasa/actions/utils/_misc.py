@@ -1,14 +1,25 @@
 # Copyright 2024 Francesco Gentile.
 # SPDX-License-Identifier: Apache-2.0
 
+import contextlib
+import contextvars
 import dataclasses
 import datetime
-from collections.abc import Iterable
+import functools
+import typing
+from collections.abc import Callable, Generator, Iterable
 from typing import Any, TypeVar
 
 import serde
 from gcp.maps import places
 
+from ._kv_store import MissingEntryError, get_kv_store
+from ._search import find_place
+
+# the key of the compact slot representation that references a stored place
+_PLACE_KEY = "place_key"
+_TIME_CACHE_SIZE = 1024
+
 
 def join(
     args: Iterable[str | None],
@@ -56,24 +67,33 @@ def serialize_iterable(x: Iterable[Any], /) -> list[dict[str, Any]]:
 
 _T = TypeVar("_T")
 
+# id of the slot value -> (slot value, place), the value is kept alive so that its
+# id is not reused while the memo is active
+_place_memo: contextvars.ContextVar[
+    dict[int, tuple[dict[str, Any], places.Place]] | None
+] = contextvars.ContextVar("_place_memo", default=None)
+
+
+@contextlib.contextmanager
+def memoize_deserialization() -> Generator[None, None, None]:
+    """Memoizes the places deserialized inside the context.
+
+    This is meant to wrap the handling of a single request: a dictionary holding a
+    place (e.g. the value of a slot) that is deserialized multiple times while the
+    context is active is decoded only once. Since the dictionaries are matched by
+    identity, they must not be modified inside the context.
+    """
+    token = _place_memo.set({})
+    try:
+        yield
+    finally:
+        _place_memo.reset(token)
+
 
 def deserialize(cls: type[_T], x: dict[str, Any], /) -> _T:
     """Deserializes an object from a dictionary."""
     if cls is places.Place:
-        opening_hours = x.pop("regular_opening_hours", None)
-        place = serde.from_dict(cls, x)
-        if opening_hours:
-            periods = [[] for _ in range(7)]
-            for idx, day_periods in enumerate(opening_hours["periods"]):
-                for s, e in day_periods:
-                    s = datetime.time.fromisoformat(s) if s else None  # noqa: PLW2901
-                    e = datetime.time.fromisoformat(e) if e else None  # noqa: PLW2901
-                    periods[idx].append((s, e))
-
-            description = opening_hours["weekday_descriptions"]
-            opening_hours = places.OpeningHours(periods, description)
-            place = dataclasses.replace(place, regular_opening_hours=opening_hours)
-        return place
+        return _memoize_place(x, _decode_place)  # type: ignore
 
     return serde.from_dict(cls, x)
 
@@ -81,3 +101,180 @@ def deserialize(cls: type[_T], x: dict[str, Any], /) -> _T:
 def deserialize_iterable(cls: type[_T], x: list[dict[str, Any]], /) -> list[_T]:
     """Deserializes a list of objects from a list of dictionaries."""
     return [deserialize(cls, item) for item in x]
+
+
+def serialize_place(place: places.Place, /) -> dict[str, Any]:
+    """Serializes a place to the compact form stored in slots.
+
+    The full place is kept in the key-value store, while the slot only holds the
+    key of the stored place together with its name and address, so that the
+    tracker sent to the action server at every turn stays small.
+    """
+    return {
+        _PLACE_KEY: get_kv_store().add_place(place),
+        "display_name": place.display_name.text if place.display_name else None,
+        "short_formatted_address": place.short_formatted_address,
+    }
+
+
+async def deserialize_place(x: dict[str, Any], /) -> places.Place:
+    """Deserializes a place from the form stored in slots.
+
+    Slots filled before places were stored in the key-value store hold the whole
+    serialized place, so they are still deserialized as such. If the referenced
+    place is no longer in the key-value store (e.g. because it was evicted), it is
+    searched again by its name and address and stored back under the same key.
+
+    Raises:
+        MissingEntryError: If the referenced place is no longer in the key-value
+            store and it cannot be found again (or a different place is found).
+    """
+    if _PLACE_KEY not in x:
+        return deserialize(places.Place, x)
+
+    store = get_kv_store()
+    try:
+        return _memoize_place(x, lambda v: store.get_place(v[_PLACE_KEY]))
+    except MissingEntryError:
+        fields = [x.get("display_name"), x.get("short_formatted_address")]
+        query = join(fields, sep=", ")
+        place = await find_place(query) if query else None
+        # the search may return a different place (e.g. if the place closed), which
+        # must not be stored under the key of the referenced one
+        if place is None or not _is_same_place(place, x):
+            raise
+
+        store.add_place(place, key=x[_PLACE_KEY])
+        return _memoize_place(x, lambda _: place)
+
+
+def is_place_expired(x: dict[str, Any], /) -> bool:
+    """Checks whether a slot references a place no longer in the key-value store.
+
+    Slots holding the whole serialized place never expire.
+    """
+    key = x.get(_PLACE_KEY)
+    return key is not None and not get_kv_store().contains_place(key)
+
+
+def _is_same_place(place: places.Place, x: dict[str, Any]) -> bool:
+    name = place.display_name.text if place.display_name else None
+    return name == x.get("display_name") and place.short_formatted_address == x.get(
+        "short_formatted_address"
+    )
+
+
+def _memoize_place(
+    x: dict[str, Any],
+    decode: Callable[[dict[str, Any]], places.Place],
+) -> places.Place:
+    memo = _place_memo.get()
+    if memo is None:
+        return decode(x)
+
+    entry = memo.get(id(x))
+    if entry is not None and entry[0] is x:
+        return entry[1]
+
+    place = decode(x)
+    memo[id(x)] = (x, place)
+    return place
+
+
+def _decode_place(x: dict[str, Any]) -> places.Place:
+    decoders = _get_place_decoders()
+    if not x.keys() <= decoders.keys():
+        # the fields not requested by the searches are left to the generic decoder
+        return _decode_place_generic(x)
+
+    fields = {k: decoders[k](v) if v is not None else None for k, v in x.items()}
+    return places.Place(**fields)
+
+
+def _decode_place_generic(x: dict[str, Any]) -> places.Place:
+    # the generic decoder cannot parse the opening hours, so they are decoded
+    # separately (without modifying the given dictionary)
+    opening_hours = x.get("regular_opening_hours")
+    place = serde.from_dict(
+        places.Place,
+        {k: v for k, v in x.items() if k != "regular_opening_hours"},
+    )
+    if not opening_hours:
+        return place
+
+    return dataclasses.replace(
+        place,
+        regular_opening_hours=_decode_opening_hours(opening_hours),
+    )
+
+
+@functools.cache
+def _get_place_decoders() -> dict[str, Callable[[Any], Any]]:
+    """Returns the decoders of the fields of the places stored in the slots.
+
+    These are the fields requested by the searches, as serialized by `serialize`.
+    The classes of the nested fields are taken from the annotations of the place,
+    so that they are built directly instead of through the generic decoder.
+    """
+    hints = typing.get_type_hints(places.Place)
+
+    def get_class(name: str) -> Any:
+        return next(a for a in typing.get_args(hints[name]) if a is not type(None))
+
+    text_cls = get_class("display_name")
+    viewport_cls = get_class("viewport")
+    parking_cls = get_class("parking_options")
+    payment_cls = get_class("payment_options")
+
+    def decode_text(v: dict[str, Any]) -> Any:
+        return text_cls(**v)
+
+    def decode_viewport(v: dict[str, Any]) -> Any:
+        return viewport_cls(**{k: places.LatLng(**p) for k, p in v.items()})
+
+    decoders: dict[str, Callable[[Any], Any]] = {
+        "display_name": decode_text,
+        "primary_type_display_name": decode_text,
+        "location": lambda v: places.LatLng(**v),
+        "viewport": decode_viewport,
+        "price_level": places.PriceLevel,
+        "rating": float,
+        "parking_options": lambda v: parking_cls(**v),
+        "payment_options": lambda v: payment_cls(**v),
+        "regular_opening_hours": _decode_opening_hours,
+    }
+    for name in [
+        "short_formatted_address",
+        "national_phone_number",
+        "website_uri",
+        "allows_dogs",
+        "good_for_children",
+        "menu_for_children",
+        "outdoor_seating",
+        "reservable",
+        "restroom",
+        "serves_vegetarian_food",
+        "takeout",
+    ]:
+        decoders[name] = _identity
+
+    return decoders
+
+
+def _decode_opening_hours(x: dict[str, Any]) -> places.OpeningHours:
+    periods = [
+        [(_parse_time(s), _parse_time(e)) for s, e in day_periods]
+        for day_periods in x["periods"]
+    ]
+    periods += [[] for _ in range(7 - len(periods))]
+    return places.OpeningHours(periods, x["weekday_descriptions"])
+
+
+def _identity(x: Any) -> Any:
+    return x
+
+
+@functools.lru_cache(maxsize=_TIME_CACHE_SIZE)
+def _parse_time(value: str | None) -> datetime.time | None:
+    # opening hours use few distinct times, so most of them are parsed only once
+    return datetime.time.fromisoformat(value) if value else None
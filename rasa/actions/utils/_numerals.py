@@ -0,0 +1,249 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+
+# --------------------------------------------------------------------------- #
+# Vocabulary
+# --------------------------------------------------------------------------- #
+
+_UNITS = {
+    "zero": 0,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+}
+_TEENS = {
+    "ten": 10,
+    "eleven": 11,
+    "twelve": 12,
+    "thirteen": 13,
+    "fourteen": 14,
+    "fifteen": 15,
+    "sixteen": 16,
+    "seventeen": 17,
+    "eighteen": 18,
+    "nineteen": 19,
+}
+_TENS = {
+    "twenty": 20,
+    "thirty": 30,
+    "forty": 40,
+    "fifty": 50,
+    "sixty": 60,
+    "seventy": 70,
+    "eighty": 80,
+    "ninety": 90,
+}
+_ORDINAL_UNITS = {
+    "first": 1,
+    "second": 2,
+    "third": 3,
+    "fourth": 4,
+    "fifth": 5,
+    "sixth": 6,
+    "seventh": 7,
+    "eighth": 8,
+    "ninth": 9,
+}
+_ORDINAL_TEENS = {
+    "tenth": 10,
+    "eleventh": 11,
+    "twelfth": 12,
+    "thirteenth": 13,
+    "fourteenth": 14,
+    "fifteenth": 15,
+    "sixteenth": 16,
+    "seventeenth": 17,
+    "eighteenth": 18,
+    "nineteenth": 19,
+}
+# the kinds of these words are the words themselves
+_MULTIPLIERS = {"hundred": 100, "thousand": 1000}
+_ORDINAL_TENS = {
+    "twentieth": 20,
+    "thirtieth": 30,
+    "fortieth": 40,
+    "fiftieth": 50,
+    "sixtieth": 60,
+    "seventieth": 70,
+    "eightieth": 80,
+    "ninetieth": 90,
+}
+
+# words denoting quantities that are not handled here, so that the text is sent
+# to Duckling instead of being parsed incompletely
+_UNSUPPORTED = {
+    "dozen",
+    "dozens",
+    "couple",
+    "pair",
+    "few",
+    "several",
+    "half",
+    "quarter",
+    "hundreds",
+    "thousands",
+    "million",
+    "millions",
+    "billion",
+    "billions",
+    "millionth",
+    "thousandth",
+    "hundredth",
+    "point",
+    "minus",
+    "negative",
+}
+
+# words that can join the groups of a spelled-out numeral
+_CONJUNCTIONS = {"and"}
+
+_TOKEN_PATTERN = re.compile(r"\d+(?:st|nd|rd|th)?|[a-z]+|\S")
+_UNSUPPORTED_PATTERN = re.compile(r"\d[.,/:]\d|-\d")
+_DIGIT_ORDINAL_PATTERN = re.compile(r"(\d+)(st|nd|rd|th)")
+
+# --------------------------------------------------------------------------- #
+# Parsing
+# --------------------------------------------------------------------------- #
+
+
+class _Unsupported(Exception):  # noqa: N818
+    """Raised when the text contains a numeral that cannot be parsed locally."""
+
+
+class _Accumulator:
+    """Accumulates the words of a spelled-out numeral."""
+
+    def __init__(self) -> None:
+        self.numbers: list[int] = []
+        self.ordinals: list[int] = []
+        self._total = 0  # the value of the complete thousands
+        self._group = 0  # the value of the current group below one thousand
+        self._last: str | None = None  # the kind of the last word of the numeral
+
+    def add(self, value: int, kind: str, *, ordinal: bool = False) -> None:
+        """Adds a word with the given value and kind to the current numeral."""
+        if not self._can_follow(kind):
+            self.flush()
+
+        match kind:
+            case "hundred":
+                self._group = (self._group or 1) * 100
+            case "thousand":
+                self._total += (self._group or 1) * 1000
+                self._group = 0
+            case _:
+                self._group += value
+
+        self._last = kind
+        if ordinal:
+            self.ordinals.append(self._total + self._group)
+            self._reset()
+
+    def can_continue(self) -> bool:
+        """Checks whether the current numeral can be continued by `and`."""
+        return self._last in ("hundred", "thousand")
+
+    def flush(self) -> None:
+        """Terminates the current numeral, if any."""
+        if self._last is not None:
+            self.numbers.append(self._total + self._group)
+            self._reset()
+
+    def _can_follow(self, kind: str) -> bool:
+        match kind:
+            case "unit":
+                return self._last in ("tens", "hundred", "thousand")
+            case "teen" | "tens":
+                return self._last in ("hundred", "thousand")
+            case "hundred":
+                return self._last in ("unit", "teen", "tens") and self._group < 100
+            case "thousand":
+                return self._last is not None and self._total == 0
+            case _:
+                return False
+
+    def _reset(self) -> None:
+        self._total = 0
+        self._group = 0
+        self._last = None
+
+
+def parse_numerals(text: str) -> tuple[list[int], list[int]] | None:
+    """Parses English cardinal and ordinal numbers from a given text.
+
+    Numbers can be written both with digits (e.g. "3", "21st") and with words
+    (e.g. "three", "twenty-first", "one hundred and five") up to the thousands.
+    The results can be used in place of the `number` and `ordinal` dimensions of
+    Duckling, without any network request.
+
+    Args:
+        text: The text to parse.
+
+    Returns:
+        The numbers and the ordinals found in the text, in order of appearance, or
+        `None` if the text contains a numeral that cannot be parsed reliably (e.g.
+        decimals, fractions or words like "dozen").
+    """
+    text = text.lower()
+    if _UNSUPPORTED_PATTERN.search(text):
+        return None
+
+    tokens = _TOKEN_PATTERN.findall(text.replace("-", " "))
+    acc = _Accumulator()
+    try:
+        for idx, token in enumerate(tokens):
+            _add_token(acc, token, tokens[idx + 1] if idx + 1 < len(tokens) else None)
+    except _Unsupported:
+        return None
+
+    acc.flush()
+    return acc.numbers, acc.ordinals
+
+
+def _add_token(acc: _Accumulator, token: str, next_token: str | None) -> None:  # noqa: C901, PLR0912
+    if token in _UNSUPPORTED:
+        raise _Unsupported
+
+    if token.isdigit():
+        if next_token in _MULTIPLIERS:
+            raise _Unsupported
+        acc.flush()
+        acc.numbers.append(int(token))
+        return
+
+    if match := _DIGIT_ORDINAL_PATTERN.fullmatch(token):
+        acc.flush()
+        acc.ordinals.append(int(match.group(1)))
+        return
+
+    if token in _UNITS:
+        acc.add(_UNITS[token], "unit")
+    elif token in _TEENS:
+        acc.add(_TEENS[token], "teen")
+    elif token in _TENS:
+        acc.add(_TENS[token], "tens")
+    elif token in _MULTIPLIERS:
+        acc.add(_MULTIPLIERS[token], token)
+    elif token in _ORDINAL_UNITS:
+        acc.add(_ORDINAL_UNITS[token], "unit", ordinal=True)
+    elif token in _ORDINAL_TEENS:
+        acc.add(_ORDINAL_TEENS[token], "teen", ordinal=True)
+    elif token in _ORDINAL_TENS:
+        acc.add(_ORDINAL_TENS[token], "tens", ordinal=True)
+    elif token in ("a", "an") and next_token in _MULTIPLIERS:
+        # "a hundred" is the same as "one hundred"
+        acc.add(1, "unit")
+    elif token in _CONJUNCTIONS and acc.can_continue():
+        # "one hundred and five", the numeral is terminated by the next word
+        # if it cannot continue it
+        return
+    else:
+        acc.flush()
@@ -1,15 +1,33 @@
 # Copyright 2024 Francesco Gentile.
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import contextlib
+import contextvars
 import dataclasses
 import datetime
-from typing import Literal, TypeAlias
+import json
+import os
+import time
+from collections.abc import Generator
+from typing import Any, Literal, TypeAlias
 
 import aiohttp
 from dateutil import parser
+from sanic import Sanic
+from sanic.exceptions import SanicException
+
+from ._cache import AsyncCache, CacheStats
+from ._numerals import parse_numerals
 
 DUCKLING_URL = "http://localhost:8000/parse"
 
+_ACTION_SERVER_NAME = "rasa_sdk"
+
+# Results are cached per bucket of reference times: within the same bucket the
+# same text always resolves to the same times, so that requests can be reused.
+_CACHE_BUCKET_SIZE = 60
+
 
 @dataclasses.dataclass(frozen=True)
 class Instant:
@@ -26,61 +44,291 @@ class Interval:
 Time: TypeAlias = Instant | Interval
 
 
-async def parse_numbers(text: str, locale: str = "en_US") -> list[int]:
-    """Parses numbers from a given text using Duckling."""
-    async with aiohttp.ClientSession() as session:
-        data = {"text": text, "locale": locale, "dims": ["number"]}
-        async with session.post(DUCKLING_URL, data=data) as response:
+class DucklingClient:
+    """Client for the Duckling HTTP API.
+
+    The client keeps a single HTTP session with a pool of keep-alive connections, so
+    that consecutive requests do not pay the cost of opening a new connection. The
+    session is created lazily inside the running event loop and must be released
+    with `close` when the client is no longer needed.
+    """
+
+    def __init__(
+        self,
+        url: str = DUCKLING_URL,
+        *,
+        max_connections: int = 16,
+        timeout: float = 5.0,
+        keepalive_timeout: float = 60.0,
+    ) -> None:
+        """Initializes the client.
+
+        Args:
+            url: The URL of the parse endpoint of the Duckling server.
+            max_connections: The maximum number of simultaneous connections.
+            timeout: The maximum time (in seconds) a request can take.
+            keepalive_timeout: The time (in seconds) an idle connection is kept open.
+        """
+        self._url = url
+        self._max_connections = max_connections
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._keepalive_timeout = keepalive_timeout
+
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def url(self) -> str:
+        """The URL of the parse endpoint of the Duckling server."""
+        return self._url
+
+    async def parse(
+        self,
+        text: str,
+        locale: str,
+        dims: list[str],
+        reftime: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Parses the text and returns the raw entities found by Duckling.
+
+        Args:
+            text: The text to parse.
+            locale: The locale of the text.
+            dims: The dimensions to extract.
+            reftime: The reference time (as a POSIX timestamp) used to resolve
+                relative times. If `None`, the current time of the server is used.
+
+        Returns:
+            The entities found by Duckling.
+        """
+        session = self._get_session()
+        data = {"text": text, "locale": locale, "dims": json.dumps(dims)}
+        if reftime is not None:
+            data["reftime"] = str(int(reftime * 1000))
+        async with session.post(self._url, data=data) as response:
             response.raise_for_status()
+            return await response.json()
+
+    async def close(self) -> None:
+        """Closes the underlying HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._loop = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # sessions are bound to the loop they were created in, so a new one is
+            # needed if the loop changed (the old one cannot be closed from here)
+            connector = aiohttp.TCPConnector(
+                limit=self._max_connections,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self._timeout,
+            )
+            self._loop = loop
+
+        return self._session
+
+
+_client: DucklingClient | None = None
+
+
+def get_duckling_client() -> DucklingClient:
+    """Returns the global Duckling client.
+
+    The client is configured through the following environment variables:
+    - `DUCKLING_URL`: the URL of the parse endpoint (default:
+      `http://localhost:8000/parse`);
+    - `DUCKLING_MAX_CONNECTIONS`: the maximum number of simultaneous connections
+      (default: 16);
+    - `DUCKLING_TIMEOUT`: the maximum time (in seconds) a request can take
+      (default: 5).
+    """
+    global _client  # noqa: PLW0603
+
+    if _client is None:
+        _client = DucklingClient(
+            os.environ.get("DUCKLING_URL", DUCKLING_URL),
+            max_connections=int(os.environ.get("DUCKLING_MAX_CONNECTIONS", "16")),
+            timeout=float(os.environ.get("DUCKLING_TIMEOUT", "5")),
+        )
+
+    return _client
+
+
+async def close_duckling_client() -> None:
+    """Closes the global Duckling client, if it was created."""
+    global _client  # noqa: PLW0603
+
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def close_duckling_client_on_shutdown(app_name: str = _ACTION_SERVER_NAME) -> bool:
+    """Closes the global Duckling client when the action server stops.
+
+    The client is closed by an `after_server_stop` listener of the Sanic
+    application of the action server, so that its pooled HTTP session is closed in
+    the event loop it was created in.
+
+    Args:
+        app_name: The name of the Sanic application of the action server.
+
+    Returns:
+        Whether the listener was registered. It is not when no application with the
+        given name exists (e.g. when the actions are not loaded by the action
+        server), in which case the session is released when the process exits.
+    """
+    try:
+        app = Sanic.get_app(app_name)
+    except SanicException:
+        return False
+
+    async def close(*_: Any) -> None:
+        await close_duckling_client()
+
+    app.register_listener(close, "after_server_stop")
+    return True
+
 
-            entities = await response.json()
-            return [e["value"]["value"] for e in entities if e["dim"] == "number"]
+@dataclasses.dataclass(frozen=True)
+class ParseResult:
+    """The entities extracted from a text by Duckling."""
+
+    numbers: tuple[int, ...]
+    ordinals: tuple[int, ...]
+    times: tuple[Time, ...]
+
+
+_turn_memo: contextvars.ContextVar[dict[tuple[str, str], ParseResult] | None] = (
+    contextvars.ContextVar("_turn_memo", default=None)
+)
+_cache: AsyncCache[tuple[str, str, float], ParseResult] = AsyncCache(
+    max_size=int(os.environ.get("DUCKLING_CACHE_SIZE", "1024")),
+    ttl=_CACHE_BUCKET_SIZE,
+)
+
+
+@contextlib.contextmanager
+def memoize_parsing() -> Generator[None, None, None]:
+    """Memoizes the results of `parse_all` inside the context.
+
+    This is meant to wrap the handling of a single turn: texts parsed multiple times
+    while the context is active (also by concurrent tasks started inside it) are
+    sent to Duckling only once. Relative times are resolved with respect to the
+    moment of the first request, so the context should not outlive the turn.
+    """
+    token = _turn_memo.set({})
+    try:
+        yield
+    finally:
+        _turn_memo.reset(token)
+
+
+async def parse_all(text: str, locale: str = "en_US") -> ParseResult:
+    """Parses numbers, ordinals and times from a given text using Duckling.
+
+    All the dimensions are extracted with a single request.
+
+    Args:
+        text: The text to parse.
+        locale: The locale of the text.
+
+    Returns:
+        The numbers, ordinals and times found in the text.
+    """
+    memo = _turn_memo.get()
+    if memo is not None and (text, locale) in memo:
+        return memo[text, locale]
+
+    # relative times are resolved with respect to the beginning of the current
+    # bucket, so that all the requests made in the same bucket share the result
+    reftime = time.time() // _CACHE_BUCKET_SIZE * _CACHE_BUCKET_SIZE
+
+    async def request() -> ParseResult:
+        entities = await get_duckling_client().parse(text, locale, _DIMS, reftime)
+        values: dict[str, list[Any]] = {dim: [] for dim in _DIMS}
+        for entity in entities:
+            if entity["dim"] in values:
+                values[entity["dim"]].append(entity["value"])
+
+        return ParseResult(
+            numbers=tuple(value["value"] for value in values["number"]),
+            ordinals=tuple(value["value"] for value in values["ordinal"]),
+            times=tuple(_to_time(value) for value in values["time"]),
+        )
+
+    result = await _cache.get_or_compute((text, locale, reftime), request)
+    if memo is not None:
+        memo[text, locale] = result
+
+    return result
+
+
+def get_parsing_cache_stats() -> CacheStats:
+    """Returns the statistics of the cache of the Duckling requests.
+
+    The size of the cache can be set with the `DUCKLING_CACHE_SIZE` environment
+    variable (default: 1024).
+    """
+    return _cache.stats
+
+
+async def parse_numbers(text: str, locale: str = "en_US") -> list[int]:
+    """Parses numbers from a given text.
+
+    English texts are parsed locally, Duckling is used only for the other locales
+    and for the texts containing numerals that cannot be parsed locally.
+    """
+    if locale.startswith("en") and (parsed := parse_numerals(text)) is not None:
+        return parsed[0]
+
+    return list((await parse_all(text, locale)).numbers)
 
 
 async def parse_ordinals(text: str, locale: str = "en_US") -> list[int]:
-    """Parses ordinals from a given text using Duckling."""
-    async with aiohttp.ClientSession() as session:
-        data = {"text": text, "locale": locale, "dims": ["ordinal"]}
-        async with session.post(DUCKLING_URL, data=data) as response:
-            response.raise_for_status()
+    """Parses ordinals from a given text.
+
+    English texts are parsed locally, Duckling is used only for the other locales
+    and for the texts containing numerals that cannot be parsed locally.
+    """
+    if locale.startswith("en") and (parsed := parse_numerals(text)) is not None:
+        return parsed[1]
 
-            entities = await response.json()
-            return [e["value"]["value"] for e in entities if e["dim"] == "ordinal"]
+    return list((await parse_all(text, locale)).ordinals)
 
 
 async def parse_times(text: str, locale: str = "en_US") -> list[Time]:
     """Parses times from a given text using Duckling."""
-    async with aiohttp.ClientSession() as session:
-        data = {"text": text, "locale": locale, "dims": ["time"]}
-        async with session.post(DUCKLING_URL, data=data) as response:
-            response.raise_for_status()
+    return list((await parse_all(text, locale)).times)
+
+
+_DIMS = ["number", "ordinal", "time"]
+
+
+def _to_time(value: dict[str, Any]) -> Time:
+    """Converts the value of a Duckling time entity to a `Time` object."""
+    if value["type"] == "interval":
+        start = Instant(
+            value=parser.parse(value["from"]["value"]).replace(tzinfo=None),
+            grain=value["from"]["grain"],
+        )
+        if "to" in value:
+            end = Instant(
+                value=parser.parse(value["to"]["value"]).replace(tzinfo=None),
+                grain=value["to"]["grain"],
+            )
+        else:
+            end = None
+
+        return Interval(start, end)
 
-            entities = await response.json()
-            times = []
-            for ent in entities:
-                if ent["dim"] != "time":
-                    continue
-                ent = ent["value"]  # noqa: PLW2901
-                if ent["type"] == "interval":
-                    start = Instant(
-                        value=parser.parse(ent["from"]["value"]).replace(tzinfo=None),
-                        grain=ent["from"]["grain"],
-                    )
-                    if "to" in ent:
-                        end = Instant(
-                            value=parser.parse(ent["to"]["value"]).replace(tzinfo=None),
-                            grain=ent["to"]["grain"],
-                        )
-                    else:
-                        end = None
-
-                    times.append(Interval(start, end))
-                else:
-                    times.append(
-                        Instant(
-                            value=parser.parse(ent["value"]).replace(tzinfo=None),
-                            grain=ent["grain"],
-                        )
-                    )
-
-            return times
+    return Instant(
+        value=parser.parse(value["value"]).replace(tzinfo=None),
+        grain=value["grain"],
+    )
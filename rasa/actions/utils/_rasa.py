@@ -7,11 +7,11 @@ import logging
 from typing import Any, overload
 
 from rasa_sdk import Action, Tracker
-from rasa_sdk.events import FollowupAction, Restarted, SlotSet
+from rasa_sdk.events import ActiveLoop, FollowupAction, Restarted, SlotSet
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.types import DomainDict
 
-from rasa.shared.core.constants import ACTION_BACK_NAME
+from rasa.shared.core.constants import ACTION_BACK_NAME, ACTION_LISTEN_NAME
 from rasa.shared.nlu.constants import (
     ENTITIES,
     ENTITY_ATTRIBUTE_GROUP,
@@ -23,10 +23,14 @@ from rasa.shared.nlu.constants import (
 )
 
 from ._grammar import agree_with_number, int_to_ordinal, pluralize, singularize
-from ._parsing import parse_numbers, parse_ordinals
+from ._kv_store import MissingEntryError, get_kv_store
+from ._misc import is_place_expired, memoize_deserialization
+from ._parsing import memoize_parsing, parse_numbers, parse_ordinals
 
 _logger = logging.getLogger(__name__)
 
+_PLACE_SLOTS = ["search_location", "user_location", "booking_place"]
+
 
 def handle_action_exceptions(x: type[Action]) -> type[Action]:
     """Wraps the `Action.run` method to handle exceptions."""
@@ -38,7 +42,29 @@ def handle_action_exceptions(x: type[Action]) -> type[Action]:
         domain: DomainDict,
     ) -> list[dict[str, Any]]:
         try:
-            return await self.wrapped_run(dispatcher, tracker, domain)  # type: ignore
+            with memoize_parsing(), memoize_deserialization():
+                return await self.wrapped_run(dispatcher, tracker, domain)  # type: ignore
+        except MissingEntryError:
+            # the searches, bookings and places referenced by the slots may have
+            # expired, so they are removed from the slots and the user is informed
+            _logger.warning("An expired entry was requested inside %s", self.name())
+            history_events = _prune_histories(tracker)
+            place_events = _clear_expired_places(tracker)
+            if history_events:
+                dispatcher.utter_message(response="utter_expired_entries")
+            if place_events:
+                dispatcher.utter_message(response="utter_expired_places")
+            if not history_events and not place_events:
+                # the entry is back in the store (e.g. it was added again by a
+                # concurrent request), so there is nothing to tell the user about
+                dispatcher.utter_message(response="utter_internal_error")
+
+            return [
+                *history_events,
+                *place_events,
+                ActiveLoop(None),
+                FollowupAction(ACTION_LISTEN_NAME),
+            ]
         except Exception:
             _logger.exception("An unexpected error occurred inside %s", self.name())
 
@@ -59,6 +85,38 @@ def handle_action_exceptions(x: type[Action]) -> type[Action]:
     return x
 
 
+def _prune_histories(tracker: Tracker) -> list[dict[str, Any]]:
+    store = get_kv_store()
+    searches = get_slot(tracker, "search_history", [])
+    bookings = get_slot(tracker, "booking_history", [])
+    expired = [key for key in searches if key and not store.contains_search(key)]
+    expired += [key for key in bookings if key and not store.contains_booking(key)]
+    if not expired:
+        return []
+
+    searches = [key for key in searches if key and key not in expired]
+    bookings = [key for key in bookings if key and key not in expired]
+
+    # the selections refer to the positions in the histories, so they are reset
+    return [
+        SlotSet("search_history", searches),
+        SlotSet("booking_history", bookings),
+        SlotSet("selected_searches", None),
+        SlotSet("selected_results", None),
+        SlotSet("selected_bookings", None),
+    ]
+
+
+def _clear_expired_places(tracker: Tracker) -> list[dict[str, Any]]:
+    events = []
+    for slot_name in _PLACE_SLOTS:
+        value = get_slot(tracker, slot_name)
+        if isinstance(value, dict) and is_place_expired(value):
+            events.append(SlotSet(slot_name, None))
+
+    return events
+
+
 @overload
 def get_slot(tracker: Tracker, slot_name: str, default: Any) -> Any: ...
 
@@ -333,6 +391,8 @@ async def resolve_mentions(  # noqa: C901, PLR0912, PLR0915
                 )
                 errors.append(msg)
         else:
+            # both are parsed locally when possible, otherwise they share the
+            # same memoized Duckling request
             ordinal = await parse_ordinals(mention)
             number = await parse_numbers(mention)
             if not ordinal and not number:
@@ -1,27 +1,35 @@
 # Copyright 2024 Francesco Gentile.
 # SPDX-License-Identifier: Apache-2.0
 
+from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import Any
 
 import gcp.maps
+import numpy as np
 import rapidfuzz
 from gcp.maps import places
 from geopy import distance
 
 from actions.records import BookingParameters, SearchParameters
 
+from ._cache import AsyncCache, CacheStats
+from ._geo import decode_geohash, encode_geohash, get_distances
 from ._grammar import pluralize
+from ._hours import OpeningHoursIndex
 
 # --------------------------------------------------------------------------- #
 # Constants
 # --------------------------------------------------------------------------- #
 
 _LOCATION_FIELDS = [
+    "location",
     "viewport",
     "short_formatted_address",
 ]
 _PLACE_FIELDS = [
     "display_name",
+    "location",
     "primary_type_display_name",
     "short_formatted_address",
     "national_phone_number",
@@ -40,6 +48,10 @@ _PLACE_FIELDS = [
     "takeout",
     "regular_opening_hours",
 ]
+# the places referenced by the slots may be locations or search results
+_STORED_PLACE_FIELDS = [*_PLACE_FIELDS, "viewport"]
+# the maximum number of results the Places API returns in a single page
+_MAX_PAGE_SIZE = 20
 _USER_LOCATION_EXAMPLES = {
     "my location",
     "my position",
@@ -55,7 +67,29 @@ _USER_LOCATION_EXAMPLES = {
     "where i reside",
 }
 
+# Text searches are cached for a short time since most of the queries issued in
+# the same area are repeated. Searches restricted to the places that are open now
+# expire sooner, since their results change as places open and close.
+_SEARCH_CACHE_SIZE = 512
+_SEARCH_CACHE_TTL = 15 * 60
+_SEARCH_CACHE_OPEN_NOW_TTL = 60
+
+# Parkings are searched for a whole geohash cell (about 150 x 150 meters) at once
+# and cached for a day, since they rarely change.
+_PARKING_CACHE_SIZE = 1024
+_PARKING_CACHE_TTL = 24 * 60 * 60
+_PARKING_GEOHASH_PRECISION = 7
+_PARKING_MAX_RESULTS = 20
+
 _client: gcp.maps.Client | None = None
+_search_cache: AsyncCache[tuple[Any, ...], list[places.Place]] = AsyncCache(
+    max_size=_SEARCH_CACHE_SIZE,
+    ttl=_SEARCH_CACHE_TTL,
+)
+_parking_cache: AsyncCache[tuple[str, int], list[places.Place]] = AsyncCache(
+    max_size=_PARKING_CACHE_SIZE,
+    ttl=_PARKING_CACHE_TTL,
+)
 
 
 def _get_client() -> gcp.maps.Client:
@@ -73,32 +107,7 @@ def _get_client() -> gcp.maps.Client:
 
 def is_place_open(place: places.Place, dt: datetime) -> bool:
     """Checks if the place is open at the given time."""
-    if place.regular_opening_hours is None:
-        msg = "The place does not have regular opening hours."
-        raise ValueError(msg)
-
-    opening_hours = place.regular_opening_hours.periods[dt.weekday()]
-
-    is_open = False
-    for start, end in opening_hours:
-        match start, end:
-            case None, None:
-                is_open = True
-                break
-            case None, _:
-                if dt.time() < end:  # type: ignore
-                    is_open = True
-                    break
-            case _, None:
-                if dt.time() >= start:
-                    is_open = True
-                    break
-            case _, _:
-                if start <= dt.time() < end:
-                    is_open = True
-                    break
-
-    return is_open
+    return OpeningHoursIndex.from_place(place).is_open_at(dt)
 
 
 def get_search_title(parameters: SearchParameters) -> str:
@@ -181,13 +190,20 @@ async def find_location(
     Returns:
         A list of locations matching the given text.
     """
-    client = _get_client()
-    locations, _ = await client.search_places_by_text(
-        query=query,
-        fields=_LOCATION_FIELDS,
-        page_size=5,
-        bias_area=bias.viewport if bias else None,
-    )
+    bias_area = bias.viewport if bias else None
+
+    async def search() -> list[places.Place]:
+        client = _get_client()
+        locations, _ = await client.search_places_by_text(
+            query=query,
+            fields=_LOCATION_FIELDS,
+            page_size=5,
+            bias_area=bias_area,
+        )
+        return locations
+
+    key = ("location", query.lower().strip(), repr(bias_area))
+    locations = list(await _search_cache.get_or_compute(key, search))
 
     if min_distance is not None:
 
@@ -211,6 +227,34 @@ async def find_location(
     return locations
 
 
+async def find_place(query: str) -> places.Place | None:
+    """Finds the place that best matches the given text.
+
+    This is used to retrieve again a place referenced by a slot that is no longer
+    in the key-value store, searching for its name and address. All the fields
+    requested for locations and search results are retrieved.
+
+    Args:
+        query: The text to search for.
+
+    Returns:
+        The first place matching the text, or `None` if no place matches.
+    """
+
+    async def search() -> list[places.Place]:
+        client = _get_client()
+        res, _ = await client.search_places_by_text(
+            query=query,
+            fields=_STORED_PLACE_FIELDS,
+            page_size=1,
+        )
+        return res
+
+    key = ("place", " ".join(query.lower().split()))
+    results = await _search_cache.get_or_compute(key, search)
+    return results[0] if results else None
+
+
 def merge_locations(*args: str) -> str:
     """Merges multiple locations into a single string.
 
@@ -287,9 +331,64 @@ async def find_parkings(
     location: places.LatLng,
     max_distance: int = 500,
 ) -> list[places.Place]:
-    """Finds parkings near the given location."""
+    """Finds the parking nearest to the given location.
+
+    The parkings are searched around the geohash cell containing the location,
+    within a radius covering `max_distance` from every point of the cell, and the
+    results are cached for a day. This way, the nearby locations (e.g. restaurants
+    in the same block) share the same search and the nearest parking is found by
+    computing the distances locally.
+
+    Args:
+        location: The location to find the parking for.
+        max_distance: The maximum distance (in meters) of the parking.
+
+    Returns:
+        A list with the nearest parking, or an empty list if there is no parking
+        within the maximum distance.
+    """
+    latitude, longitude = tuple(location)[:2]
+    cell = encode_geohash(latitude, longitude, _PARKING_GEOHASH_PRECISION)
+    center, cell_radius = decode_geohash(cell)
+
+    async def search() -> list[places.Place]:
+        client = _get_client()
+        return await client.search_nearby_places(
+            area=places.CircularArea(
+                places.LatLng(*center), max_distance + cell_radius
+            ),
+            fields=["location"],
+            included_primary_types=["parking"],
+            max_num_results=_PARKING_MAX_RESULTS,
+            rank_by="distance",
+        )
+
+    parkings = await _parking_cache.get_or_compute((cell, max_distance), search)
+    if len(parkings) == 0:
+        return []
+
+    distances = get_distances(location, [parking.location for parking in parkings])
+    nearest = int(np.argmin(distances))
+    if len(parkings) == _PARKING_MAX_RESULTS:
+        # The search may have left out some parkings, all farther from the center
+        # than the last one returned. The nearest cached parking is the actual
+        # nearest only if no such parking can be closer to the location.
+        farthest, offset = get_distances(center, [parkings[-1].location, location])
+        if distances[nearest] > farthest - offset:
+            return await _find_nearest_parking(location, max_distance)
+
+    if distances[nearest] > max_distance:
+        return []
+
+    return [parkings[nearest]]
+
+
+async def _find_nearest_parking(
+    location: places.LatLng,
+    max_distance: int,
+) -> list[places.Place]:
     client = _get_client()
-    parkings = await client.search_nearby_places(
+    return await client.search_nearby_places(
         area=places.CircularArea(location, max_distance),
         fields=["location"],
         included_primary_types=["parking"],
@@ -297,27 +396,14 @@ async def find_parkings(
         rank_by="distance",
     )
 
-    return parkings
-
 
 # --------------------------------------------------------------------------- #
 # Search for places
 # --------------------------------------------------------------------------- #
 
 
-async def find_places(  # noqa: C901
-    parameters: SearchParameters,
-    return_n: int = 15,
-) -> list[places.Place]:
-    """Searches for places using the Google Places API.
-
-    Args:
-        parameters: The search parameters.
-        return_n: The maximum number of results to return.
-
-    Returns:
-        A list of places matching the search criteria.
-    """
+def _get_query(parameters: SearchParameters) -> tuple[str, str | None]:
+    """Returns the text query and the included type for the given parameters."""
     query = ""
     if parameters.place_name:
         query += parameters.place_name + " "
@@ -342,24 +428,129 @@ async def find_places(  # noqa: C901
     if query != "places":
         included_type = None
 
-    results = []
+    return query, included_type
+
+
+async def iter_places(
+    parameters: SearchParameters,
+    max_results: int | None = None,
+) -> AsyncIterator[places.Place]:
+    """Iterates over the places matching the search parameters.
+
+    Pages are requested lazily from the Google Places API following the page
+    tokens returned by the previous responses, so that places are yielded as soon
+    as their page arrives and no request is made for pages the caller does not
+    consume.
+
+    Args:
+        parameters: The search parameters.
+        max_results: The maximum number of places to yield. If `None`, all the
+            available pages are fetched.
+
+    Yields:
+        The places matching the search criteria, in the order returned by the API.
+    """
+    query, included_type = _get_query(parameters)
     client = _get_client()
-    while len(results) < return_n:
-        page_size = min(20, return_n - len(results))
-        res, next_page_token = await client.search_places_by_text(
+
+    count = 0
+    page_token = None
+    while max_results is None or count < max_results:
+        page_size = _MAX_PAGE_SIZE
+        if max_results is not None:
+            page_size = min(page_size, max_results - count)
+
+        res, page_token = await client.search_places_by_text(
             query=query,
             fields=_PLACE_FIELDS,
             included_type=included_type,
             bias_area=parameters.location.viewport,
             page_size=page_size,
+            page_token=page_token,
             open_now=parameters.open_now or False,
             price_levels=parameters.get_price_levels(),
             min_rating=parameters.get_min_rating(),
             rank_by=parameters.rank_by,
         )
 
-        results.extend(res)
-        if not next_page_token:
+        for place in res[:page_size]:
+            yield place
+            count += 1
+
+        if not page_token:
             break
 
-    return results
+
+async def find_places(
+    parameters: SearchParameters,
+    return_n: int = 15,
+) -> list[places.Place]:
+    """Searches for places using the Google Places API.
+
+    Args:
+        parameters: The search parameters.
+        return_n: The maximum number of results to return.
+
+    Returns:
+        A list of places matching the search criteria.
+
+    !!! note
+
+        Results are cached by the normalized search parameters, so repeated searches
+        are served without contacting the API. Concurrent identical searches share
+        the same request.
+    """
+    query, included_type = _get_query(parameters)
+    price_levels = parameters.get_price_levels()
+    key = (
+        "places",
+        " ".join(query.lower().split()),
+        included_type,
+        repr(parameters.location.viewport),
+        bool(parameters.open_now),
+        tuple(sorted(price_levels, key=str)) if price_levels else None,
+        parameters.get_min_rating(),
+        parameters.rank_by,
+        return_n,
+    )
+    ttl = _SEARCH_CACHE_OPEN_NOW_TTL if parameters.open_now else _SEARCH_CACHE_TTL
+
+    async def search() -> list[places.Place]:
+        results = [place async for place in iter_places(parameters, return_n)]
+        # index the opening hours of the results now, so that the following
+        # queries on the stored search do not need to
+        for place in results:
+            if place.regular_opening_hours is not None:
+                OpeningHoursIndex.from_place(place)
+        return results
+
+    results = await _search_cache.get_or_compute(key, search, ttl)
+    # the callers are free to modify the returned list
+    return list(results)
+
+
+def rank_by_distance(
+    places_: list[places.Place],
+    origin: places.Place,
+) -> list[int] | None:
+    """Sorts places by their distance from a location without contacting the API.
+
+    Args:
+        places_: The places to sort.
+        origin: The location from which the distances are computed.
+
+    Returns:
+        The indices of the places sorted by increasing distance (places at the same
+        distance keep their relative order), or `None` if the location of the
+        origin or of any of the places is unknown.
+    """
+    if origin.location is None or any(p.location is None for p in places_):
+        return None
+
+    distances = get_distances(origin.location, [p.location for p in places_])
+    return np.argsort(distances, kind="stable").tolist()
+
+
+def get_search_cache_stats() -> CacheStats:
+    """Returns the statistics of the cache of the Places text searches."""
+    return _search_cache.stats
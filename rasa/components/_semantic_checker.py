@@ -1,13 +1,22 @@
 # Copyright 2024 Francesco Gentile.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Any
-
-import requests
+import asyncio
+import atexit
+import json
+import logging
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Generic, Literal, TypeVar
+
+import aiohttp
+import numpy as np
 import torch
 from bs4 import BeautifulSoup
 from fake_headers import Headers
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import SentenceTransformer
 
 from rasa.engine.graph import ExecutionContext, GraphComponent
 from rasa.engine.recipes.default_recipe import DefaultV1Recipe
@@ -23,53 +32,157 @@ from rasa.shared.nlu.constants import (
 from rasa.shared.nlu.training_data.message import Message
 from rasa.shared.nlu.training_data.training_data import TrainingData
 
+_logger = logging.getLogger(__name__)
+
+_DEFINITIONS_FILE = "definitions.json"
+_QUANTIZED_MODEL_FILE = "quantized_state.pt"
+_INDEX_FILE = "knn_index.npz"
+# the labelled examples needed to check the agreement of the quantized model
+_MIN_EVALUATION_EXAMPLES = 20
+
+_T = TypeVar("_T")
+
 
 @DefaultV1Recipe.register(
     DefaultV1Recipe.ComponentType.ENTITY_EXTRACTOR,
-    is_trainable=False,
+    is_trainable=True,
 )
 class SemanticChecker(GraphComponent, EntityExtractorMixin):
-    """A component that checks if an entity belongs to a given semantic category."""
+    """A component that checks if an entity belongs to a given semantic category.
+
+    The definitions of the entity values are retrieved from the Cambridge
+    Dictionary. During training, the definitions of all the values of the checked
+    entity types found in the training data are retrieved and persisted with the
+    model, so that at inference time the dictionary is contacted only for unseen
+    values.
+
+    Alternatively, with the `knn` classifier the component works fully offline: a
+    curated vocabulary of positive and negative examples of each entity type (plus
+    the values found in the training data, as positives) is embedded during
+    training and persisted as a matrix of normalized vectors. The entity values
+    are then classified by a similarity-weighted vote of their `k` nearest
+    neighbours in that matrix.
+
+    Two inference modes are available:
+    - `float`: the sentence transformer runs in full precision, on the GPU if
+      `use_gpu` is set.
+    - `int8`: the linear layers of the sentence transformer are quantized to 8-bit
+      integers during training, to speed up the inference on CPU. The weights of
+      the quantized model are persisted with the component, after checking that
+      its verdicts on a labelled evaluation set (the `evaluation` positives and
+      negatives of each entity type, kept out of the vocabulary while the model
+      is checked) agree with those of the full precision model on at least
+      `min_parity` of the examples.
+    """
 
     # ----------------------------------------------------------------------- #
     # Constructor and Factory Methods
     # ----------------------------------------------------------------------- #
 
-    def __init__(
+    def __init__(  # noqa: C901
         self,
         *,
         default_locale: str,
         model_name: str,
         use_gpu: bool,
         min_cosine_similarity: float,
-        entities: list[dict[str, str]],
+        entities: list[dict[str, Any]],
+        model_storage: ModelStorage,
+        resource: Resource,
+        definitions: "_DefinitionCache",
+        cache_size: int = 1024,
+        batch_size: int = 32,
+        inference_mode: Literal["float", "int8"] = "float",
+        min_parity: float = 0.95,
+        num_threads: int | None = None,
+        max_connections: int = 8,
+        time_budget: float = 5.0,
+        request_timeout: float = 10.0,
+        classifier: Literal["dictionary", "knn"] = "dictionary",
+        k: int = 5,
+        model: SentenceTransformer | None = None,
+        index: dict[str, tuple[np.ndarray, np.ndarray]] | None = None,
     ) -> None:
         super().__init__()
 
+        if classifier not in ("dictionary", "knn"):
+            msg = f"Unsupported classifier '{classifier}'."
+            raise ValueError(msg)
+
+        if inference_mode not in ("float", "int8"):
+            msg = f"Unsupported inference mode '{inference_mode}'."
+            raise ValueError(msg)
+        if inference_mode == "int8" and use_gpu:
+            msg = "The 'int8' inference mode is only supported on CPU."
+            raise ValueError(msg)
+
         self._country = _extract_country(default_locale)
+        self._model_storage = model_storage
+        self._resource = resource
+        self._definitions = definitions
+        self._fetcher = _DefinitionFetcher(max_connections, request_timeout)
+        self._time_budget = time_budget
 
-        self._model = SentenceTransformer(model_name)
-        if use_gpu:
-            self._model = self._model.to("cuda")
-        self._model = self._model.eval()
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
 
+        self._inference_mode = inference_mode
+        self._min_parity = min_parity
         self._min_cosine_similarity = min_cosine_similarity
+        self._batch_size = batch_size
+        self._cache_size = cache_size
+        self._classifier = classifier
+        self._k = k
+        self._index = index or {}
 
         self._entities = {}
+        self._vocabulary: dict[str, tuple[list[str], list[str]]] = {}
+        self._evaluation: dict[tuple[str, str], bool] = {}
         for entity in entities:
             if entity["type"] in self._entities:
                 msg = f"Duplicate entity type '{entity['type']}' found."
                 raise ValueError(msg)
+            if classifier == "dictionary" and "template" not in entity:
+                msg = f"Missing template for entity type '{entity['type']}'."
+                raise ValueError(msg)
+
+            self._entities[entity["type"]] = entity.get("template")
+            self._vocabulary[entity["type"]] = (
+                list(entity.get("positives", [])),
+                list(entity.get("negatives", [])),
+            )
+            evaluation = entity.get("evaluation", {})
+            for label, key in ((True, "positives"), (False, "negatives")):
+                for value in evaluation.get(key, []):
+                    self._evaluation[entity["type"], value] = label
+
+        if (
+            inference_mode == "int8"
+            and len(self._evaluation) < _MIN_EVALUATION_EXAMPLES
+        ):
+            msg = (
+                f"The 'int8' inference mode requires at least "
+                f"{_MIN_EVALUATION_EXAMPLES} evaluation examples."
+            )
+            raise ValueError(msg)
 
-            self._entities[entity["type"]] = entity["template"]
+        if model is None:
+            model = SentenceTransformer(model_name)
+            if use_gpu:
+                model = model.to("cuda")
+        self._set_model(model)
 
     @classmethod
     def create(
         cls,
         config: dict[str, Any],
-        model_storage: ModelStorage,  # noqa: ARG003
-        resource: Resource,  # noqa: ARG003
+        model_storage: ModelStorage,
+        resource: Resource,
         execution_context: ExecutionContext,  # noqa: ARG003
+        *,
+        definitions: "_DefinitionCache | None" = None,
+        model: SentenceTransformer | None = None,
+        index: dict[str, tuple[np.ndarray, np.ndarray]] | None = None,
     ) -> GraphComponent:
         return cls(
             default_locale=config["default_locale"],
@@ -77,6 +190,70 @@ class SemanticChecker(GraphComponent, EntityExtractorMixin):
             use_gpu=config["use_gpu"],
             min_cosine_similarity=config["min_cosine_similarity"],
             entities=config["entities"],
+            model_storage=model_storage,
+            resource=resource,
+            definitions=definitions or _DefinitionCache(config["cache_size"]),
+            cache_size=config["cache_size"],
+            batch_size=config["batch_size"],
+            inference_mode=config["inference_mode"],
+            min_parity=config["min_parity"],
+            num_threads=config["num_threads"],
+            max_connections=config["max_connections"],
+            time_budget=config["time_budget"],
+            request_timeout=config["request_timeout"],
+            classifier=config["classifier"],
+            k=config["k"],
+            model=model,
+            index=index,
+        )
+
+    @classmethod
+    def load(
+        cls,
+        config: dict[str, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+        **kwargs: Any,  # noqa: ARG003
+    ) -> GraphComponent:
+        definitions = _DefinitionCache(config["cache_size"])
+        model = None
+        index = None
+        try:
+            with model_storage.read_from(resource) as model_dir:
+                if (model_dir / _DEFINITIONS_FILE).exists():
+                    definitions.load(model_dir / _DEFINITIONS_FILE)
+                if (model_dir / _QUANTIZED_MODEL_FILE).exists():
+                    model = _load_quantized_model(
+                        config["model_name"], model_dir / _QUANTIZED_MODEL_FILE
+                    )
+                if (model_dir / _INDEX_FILE).exists():
+                    index = _load_index(model_dir / _INDEX_FILE)
+        except ValueError:
+            _logger.warning(
+                "Could not load the persisted data, the definitions will be "
+                "retrieved from the dictionary."
+            )
+
+        if config["inference_mode"] == "int8" and model is None:
+            _logger.warning(
+                "Could not load the quantized model, the full precision model "
+                "will be used."
+            )
+        if config["classifier"] == "knn" and index is None:
+            _logger.warning(
+                "Could not load the nearest-neighbour index, the entities will "
+                "not be checked."
+            )
+
+        return cls.create(
+            config,
+            model_storage,
+            resource,
+            execution_context,
+            definitions=definitions,
+            model=model,
+            index=index,
         )
 
     # ----------------------------------------------------------------------- #
@@ -85,7 +262,14 @@ class SemanticChecker(GraphComponent, EntityExtractorMixin):
 
     @staticmethod
     def required_packages() -> list[str]:
-        return ["requests", "fake_headers", "bs4", "sentence_transformers", "torch"]
+        return [
+            "aiohttp",
+            "fake_headers",
+            "bs4",
+            "numpy",
+            "sentence_transformers",
+            "torch",
+        ]
 
     @staticmethod
     def supported_languages() -> list[str] | None:
@@ -100,20 +284,95 @@ class SemanticChecker(GraphComponent, EntityExtractorMixin):
             "use_gpu": True,
             "min_cosine_similarity": 0.5,
             "entities": [],
+            "cache_size": 1024,
+            "batch_size": 32,
+            "inference_mode": "float",
+            "min_parity": 0.95,
+            "num_threads": None,
+            "max_connections": 8,
+            "time_budget": 5.0,
+            "request_timeout": 10.0,
+            "classifier": "dictionary",
+            "k": 5,
         }
 
+    def train(self, training_data: TrainingData) -> Resource:
+        # pre-warm the cache with the values of the entities in the training data,
+        # so that at inference time the dictionary is rarely contacted
+        examples = set()
+        for message in training_data.entity_examples:
+            for entity in message.get(ENTITIES, []):
+                if entity[ENTITY_ATTRIBUTE_TYPE] in self._entities:
+                    value = str(entity[ENTITY_ATTRIBUTE_VALUE])
+                    examples.add((entity[ENTITY_ATTRIBUTE_TYPE], value))
+
+        held_out: set[tuple[str, str]] = set()
+        if self._classifier == "dictionary":
+            words = {word for _, word in examples | self._evaluation.keys()}
+            self._fetch_definitions([(word, self._country) for word in words], None)
+        else:
+            new_examples = sorted(
+                (entity_type, value)
+                for entity_type, value in examples
+                if not any(value in words for words in self._vocabulary[entity_type])
+            )
+            # the values added to the index are their own nearest neighbours, so
+            # the evaluation values are added only after the quantized model has
+            # been checked
+            held_out = {e for e in new_examples if e in self._evaluation}
+            self._add_positives([e for e in new_examples if e not in held_out])
+            self._build_index()
+
+        quantized = None
+        if self._inference_mode == "int8":
+            quantized = self._quantize()
+        if held_out:
+            self._add_positives(sorted(held_out))
+            self._build_index()
+
+        with self._model_storage.write_to(self._resource) as model_dir:
+            self._definitions.save(model_dir / _DEFINITIONS_FILE)
+            if quantized is not None:
+                # only the weights are saved, so that loading them does not
+                # unpickle arbitrary objects
+                torch.save(quantized.state_dict(), model_dir / _QUANTIZED_MODEL_FILE)
+            if self._classifier == "knn":
+                _save_index(self._index, model_dir / _INDEX_FILE)
+
+        return self._resource
+
     def process_training_data(self, training_data: TrainingData) -> TrainingData:
         return training_data
 
     def process(self, messages: list[Message]) -> list[Message]:
+        # the entities of all the messages are checked together, so that the
+        # definitions are encoded in batches and scored with a single product
+        countries = []
+        words = []
         for message in messages:
             metadata = message.get(METADATA) or {}
             locale = metadata.get("locale")
             country = _extract_country(locale) if locale else self._country
+            countries.append(country)
+            words.extend(
+                (entity[ENTITY_ATTRIBUTE_VALUE], country)
+                for entity in message.get(ENTITIES, [])
+                if entity[ENTITY_ATTRIBUTE_TYPE] in self._entities
+            )
+
+        # the missing definitions of all the entities are retrieved concurrently
+        if self._classifier == "dictionary":
+            self._fetch_definitions(words, self._time_budget)
+
+        pending: list[tuple[dict[str, Any], str, str | None]] = []
+        for message, country in zip(messages, countries, strict=True):
             entities = message.get(ENTITIES, []).copy()
-            self._update_entities(entities, country)
+            pending.extend(self._update_entities(entities, country))
             message.set(ENTITIES, entities, add_to_output=True)
 
+        if pending:
+            self._check(pending)
+
         return messages
 
     # ----------------------------------------------------------------------- #
@@ -124,26 +383,446 @@ class SemanticChecker(GraphComponent, EntityExtractorMixin):
         self,
         entities: list[dict[str, Any]],
         country: str | None,
-    ) -> None:
+    ) -> list[tuple[dict[str, Any], str, str | None]]:
+        pending = []
         for entity in entities:
-            if entity[ENTITY_ATTRIBUTE_TYPE] in self._entities:
-                template = self._entities[entity[ENTITY_ATTRIBUTE_TYPE]]
-                definitions = _get_definitions(entity[ENTITY_ATTRIBUTE_VALUE], country)
+            entity_type = entity[ENTITY_ATTRIBUTE_TYPE]
+            if entity_type in self._entities:
+                value = entity[ENTITY_ATTRIBUTE_VALUE]
+                self.add_processor_name(entity)
 
-                entity["template"] = template
-                entity["definitions"] = definitions
-                entity["is_correct"] = self._check_meaning(template, definitions)
+                if self._classifier == "knn":
+                    if entity_type not in self._index:
+                        entity["is_checked"] = False
+                        continue
+                else:
+                    definitions = self._definitions.get(value, country)
+                    if definitions is None:
+                        # the definitions could not be retrieved in time, the
+                        # entity is left unchecked
+                        entity["is_checked"] = False
+                        continue
+
+                    entity["template"] = self._entities[entity_type]
+                    entity["definitions"] = definitions
+
+                key = f"{entity_type}:{_get_cache_key(value, country)}"
+                is_correct = self._verdicts.get(key)
+                if is_correct is not None:
+                    entity["is_correct"] = is_correct
+                else:
+                    pending.append((entity, key, country))
+
+        return pending
+
+    def _add_positives(self, examples: list[tuple[str, str]]) -> None:
+        for entity_type, value in examples:
+            self._vocabulary[entity_type][0].append(value)
+
+    def _set_model(self, model: SentenceTransformer) -> None:
+        self._model = model.eval()
+
+        # the templates are constant, so they are encoded only once
+        self._template_embeds: dict[str, torch.Tensor] = {}
+        templates = [t for t in self._entities.values() if t is not None]
+        if templates:
+            embeds = self._encode(templates)
+            self._template_embeds = dict(zip(templates, embeds, strict=True))
+
+        self._definition_embeds: _LRUCache[torch.Tensor] = _LRUCache(self._cache_size)
+        self._verdicts: _LRUCache[bool] = _LRUCache(self._cache_size)
+
+    def _quantize(self) -> SentenceTransformer | None:
+        float_model = self._model
+        quantized = _quantize_model(float_model)
+
+        # the verdicts of the quantized model must agree with those of the full
+        # precision one on the labelled evaluation examples
+        examples = set(self._evaluation)
+        if self._classifier == "dictionary":
+            examples = {
+                e for e in examples if self._definitions.get(e[1], self._country)
+            }
+        float_verdicts = self._get_verdicts(examples)
+        self._set_model(quantized)
+        if self._classifier == "knn":
+            self._build_index()
+        quantized_verdicts = self._get_verdicts(examples)
+
+        # the examples that could not be checked by either model are ignored
+        checked = float_verdicts.keys() & quantized_verdicts.keys()
+        matches = sum(float_verdicts[e] == quantized_verdicts[e] for e in checked)
+        parity = matches / len(checked) if checked else 0.0
+        _logger.info(
+            "The quantized model agrees with the full precision model on %d/%d "
+            "examples (accuracy: %.2f full precision, %.2f quantized).",
+            matches,
+            len(checked),
+            _get_accuracy(float_verdicts, self._evaluation),
+            _get_accuracy(quantized_verdicts, self._evaluation),
+        )
+        if len(checked) < _MIN_EVALUATION_EXAMPLES or parity < self._min_parity:
+            _logger.warning(
+                "The parity of the quantized model (%.2f on %d examples) is below "
+                "%.2f, the full precision model will be used.",
+                parity,
+                len(checked),
+                self._min_parity,
+            )
+            self._set_model(float_model)
+            if self._classifier == "knn":
+                self._build_index()
+            return None
+
+        return quantized
+
+    def _get_verdicts(
+        self,
+        examples: set[tuple[str, str]],
+    ) -> dict[tuple[str, str], bool]:
+        entities: dict[tuple[str, str], dict[str, Any]] = {
+            (entity_type, value): {
+                ENTITY_ATTRIBUTE_TYPE: entity_type,
+                ENTITY_ATTRIBUTE_VALUE: value,
+            }
+            for entity_type, value in examples
+        }
+        pending = self._update_entities(list(entities.values()), self._country)
+        self._check(pending)
+        # the entities that could not be checked (e.g. because their type has no
+        # index) have no verdict
+        return {
+            example: entity["is_correct"]
+            for example, entity in entities.items()
+            if "is_correct" in entity
+        }
 
-                self.add_processor_name(entity)
+    def _fetch_definitions(
+        self,
+        words: list[tuple[str, str | None]],
+        time_budget: float | None,
+    ) -> None:
+        missing = {
+            (word, country)
+            for word, country in words
+            if self._definitions.get(word, country) is None
+        }
+        if not missing:
+            return
+
+        fetched = self._fetcher.fetch(list(missing), time_budget)
+        for (word, country), definitions in fetched.items():
+            self._definitions.put(word, country, definitions)
+
+        if len(fetched) < len(missing):
+            _logger.warning(
+                "The definitions of %d words could not be retrieved.",
+                len(missing) - len(fetched),
+            )
+
+    def _build_index(self) -> None:
+        self._index = {}
+        for entity_type, (positives, negatives) in self._vocabulary.items():
+            if not positives and not negatives:
+                continue
+            if not positives or not negatives:
+                _logger.warning(
+                    "The vocabulary of the entity type '%s' contains only %s examples.",
+                    entity_type,
+                    "positive" if positives else "negative",
+                )
+
+            vectors = self._encode([*positives, *negatives]).cpu().numpy()
+            labels = np.array([True] * len(positives) + [False] * len(negatives))
+            self._index[entity_type] = (vectors.astype(np.float32), labels)
+
+    def _check(self, pending: list[tuple[dict[str, Any], str, str | None]]) -> None:
+        if self._classifier == "knn":
+            self._classify(pending)
+        else:
+            self._check_meanings(pending)
+
+    def _classify(self, pending: list[tuple[dict[str, Any], str, str | None]]) -> None:
+        values = list({entity[ENTITY_ATTRIBUTE_VALUE] for entity, _, _ in pending})
+        embeds = self._encode(values).cpu().numpy()
+        rows = {value: idx for idx, value in enumerate(values)}
+
+        by_type: dict[str, list[tuple[dict[str, Any], str]]] = {}
+        for entity, verdict_key, _ in pending:
+            by_type.setdefault(entity[ENTITY_ATTRIBUTE_TYPE], []).append((
+                entity,
+                verdict_key,
+            ))
+
+        for entity_type, group in by_type.items():
+            vectors, labels = self._index[entity_type]
+            k = min(self._k, len(labels))
+            group_rows = [rows[entity[ENTITY_ATTRIBUTE_VALUE]] for entity, _ in group]
+
+            # the vectors are normalized, so the product gives the similarities
+            scores = embeds[group_rows] @ vectors.T
+            neighbours = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            neighbour_scores = np.take_along_axis(scores, neighbours, axis=1)
+            votes = np.where(labels[neighbours], neighbour_scores, -neighbour_scores)
+
+            for (entity, verdict_key), vote in zip(
+                group, votes.sum(axis=1), strict=True
+            ):
+                is_correct = bool(vote > 0)
+                entity["is_correct"] = is_correct
+                self._verdicts.put(verdict_key, is_correct)
+
+    def _check_meanings(
+        self,
+        pending: list[tuple[dict[str, Any], str, str | None]],
+    ) -> None:
+        word_embeds = self._get_definition_embeds(pending)
+
+        # score every definition against every template at once, the embeddings
+        # are normalized so the product gives the cosine similarities
+        offsets: dict[str, tuple[int, int]] = {}
+        chunks = []
+        start = 0
+        for key, embeds in word_embeds.items():
+            if embeds is not None:
+                offsets[key] = (start, start + len(embeds))
+                chunks.append(embeds)
+                start += len(embeds)
+
+        templates = list(self._template_embeds)
+        scores = None
+        if chunks:
+            definition_embeds = torch.cat(chunks)
+            template_embeds = torch.stack(list(self._template_embeds.values()))
+            scores = definition_embeds @ template_embeds.to(definition_embeds).T
+
+        for entity, verdict_key, country in pending:
+            key = _get_cache_key(entity[ENTITY_ATTRIBUTE_VALUE], country)
+            is_correct = False
+            if scores is not None and key in offsets:
+                start, end = offsets[key]
+                column = templates.index(entity["template"])
+                max_score = scores[start:end, column].max().item()
+                is_correct = max_score > self._min_cosine_similarity
+
+            entity["is_correct"] = is_correct
+            self._verdicts.put(verdict_key, is_correct)
+
+    def _get_definition_embeds(
+        self,
+        pending: list[tuple[dict[str, Any], str, str | None]],
+    ) -> dict[str, torch.Tensor | None]:
+        # gather the embeddings of the definitions of every distinct word, those
+        # not cached yet are encoded in a single batch
+        word_embeds: dict[str, torch.Tensor | None] = {}
+        missing: dict[str, list[str]] = {}
+        for entity, _, country in pending:
+            key = _get_cache_key(entity[ENTITY_ATTRIBUTE_VALUE], country)
+            if key in word_embeds or key in missing:
+                continue
+            if len(entity["definitions"]) == 0:
+                word_embeds[key] = None
+                continue
+
+            embeds = self._definition_embeds.get(key)
+            if embeds is not None:
+                word_embeds[key] = embeds
+            else:
+                missing[key] = entity["definitions"]
+
+        if missing:
+            sentences = [d for definitions in missing.values() for d in definitions]
+            embeds = self._encode(sentences)
+            sizes = [len(definitions) for definitions in missing.values()]
+            for key, chunk in zip(missing, embeds.split(sizes), strict=True):
+                self._definition_embeds.put(key, chunk)
+                word_embeds[key] = chunk
+
+        return word_embeds
 
     @torch.no_grad()  # type: ignore
-    def _check_meaning(self, template: str, definitions: list[str]) -> bool:
-        if len(definitions) == 0:
-            return False
+    def _encode(self, sentences: list[str]) -> torch.Tensor:
+        return self._model.encode(  # type: ignore
+            sentences,
+            batch_size=self._batch_size,
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+        )
+
 
-        embeds = self._model.encode([template, *definitions], convert_to_tensor=True)
-        cosine_scores = util.pytorch_cos_sim(embeds[0], embeds[1:])[0]  # type: ignore
-        return cosine_scores.max().item() > self._min_cosine_similarity
+# --------------------------------------------------------------------------- #
+# Private Classes
+# --------------------------------------------------------------------------- #
+
+
+class _DefinitionFetcher:
+    """Retrieves the definitions of the words concurrently.
+
+    The requests are sent through a pool of connections by an event loop running
+    in a background thread, since the callers are synchronous. The callers (and
+    so the event loop of the server calling them) are blocked until all the
+    requests are done or the time budget runs out, whichever comes first.
+
+    The HTTP session and the event loop are closed when the process exits, or
+    earlier by calling `close`.
+    """
+
+    def __init__(self, max_connections: int, timeout: float) -> None:
+        self._max_connections = max_connections
+        self._timeout = timeout
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._lock = threading.Lock()
+
+    def fetch(
+        self,
+        words: list[tuple[str, str | None]],
+        time_budget: float | None,
+    ) -> dict[tuple[str, str | None], list[str]]:
+        """Retrieves the definitions of the given (word, country) pairs.
+
+        Args:
+            words: The words to retrieve the definitions of, with their country.
+            time_budget: The maximum time (in seconds) to wait for the
+                definitions. If `None`, all the requests are awaited.
+
+        Returns:
+            The definitions of the words that were retrieved successfully within
+            the time budget.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch_all(words, time_budget), self._get_loop()
+        )
+        return future.result()
+
+    def close(self) -> None:
+        """Closes the HTTP session and stops the event loop, if they were started."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        atexit.unregister(self.close)
+        future = asyncio.run_coroutine_threadsafe(self._close_session(), loop)
+        try:
+            future.result(timeout=self._timeout)
+        except Exception:
+            _logger.exception("Could not close the HTTP session.")
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="semantic-checker",
+                    daemon=True,
+                )
+                thread.start()
+                # the components have no teardown hook, so the session is closed
+                # when the process exits
+                atexit.register(self.close)
+
+            return self._loop
+
+    async def _close_session(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _fetch_all(
+        self,
+        words: list[tuple[str, str | None]],
+        time_budget: float | None,
+    ) -> dict[tuple[str, str | None], list[str]]:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._max_connections),
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+            )
+
+        tasks = {}
+        for word, country in words:
+            coro = _get_definitions(self._session, word, country)
+            tasks[asyncio.create_task(coro)] = (word, country)
+
+        done, not_done = await asyncio.wait(tasks, timeout=time_budget)
+        for task in not_done:
+            task.cancel()
+
+        # a failed lookup (e.g. an unexpected page) only loses its own word, the
+        # entity is then left unchecked
+        results = {}
+        for task in done:
+            word, _ = tasks[task]
+            try:
+                results[tasks[task]] = task.result()
+            except Exception:
+                _logger.exception("Could not retrieve the definitions of '%s'.", word)
+
+        return results
+
+
+class _LRUCache(Generic[_T]):
+    """Bounded mapping that evicts the least recently used entries."""
+
+    def __init__(self, max_size: int) -> None:
+        self._entries: OrderedDict[str, _T] = OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> _T | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+
+        return value
+
+    def put(self, key: str, value: _T) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def items(self) -> list[tuple[str, _T]]:
+        with self._lock:
+            return list(self._entries.items())
+
+
+class _DefinitionCache:
+    """Two-level cache of the definitions of the words.
+
+    The first level contains the definitions persisted with the model, the second
+    one is a bounded LRU cache of the definitions retrieved at inference time.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._persisted: dict[str, list[str]] = {}
+        self._recent: _LRUCache[list[str]] = _LRUCache(max_size)
+
+    def get(self, word: str, country: str | None) -> list[str] | None:
+        key = _get_cache_key(word, country)
+        definitions = self._persisted.get(key)
+        if definitions is None:
+            definitions = self._recent.get(key)
+
+        return definitions
+
+    def put(self, word: str, country: str | None, definitions: list[str]) -> None:
+        self._recent.put(_get_cache_key(word, country), definitions)
+
+    def load(self, path: Path) -> None:
+        with path.open(encoding="utf-8") as f:
+            self._persisted = json.load(f)
+
+    def save(self, path: Path) -> None:
+        # all the definitions are persisted, the recent ones included
+        data = {**self._persisted, **dict(self._recent.items())}
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
 
 
 # --------------------------------------------------------------------------- #
@@ -151,10 +830,80 @@ class SemanticChecker(GraphComponent, EntityExtractorMixin):
 # --------------------------------------------------------------------------- #
 
 
-def _get_definitions(word: str, country: str | None) -> list[str]:
+def _quantize_model(model: SentenceTransformer) -> SentenceTransformer:
+    # a quantized copy is returned, the model is left unchanged
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def _load_quantized_model(model_name: str, path: Path) -> SentenceTransformer | None:
+    """Loads the weights of a quantized model saved during training.
+
+    Only the weights are saved, so the model is quantized again before they are
+    loaded into it.
+
+    Args:
+        model_name: The name of the full precision model.
+        path: The path to the saved weights.
+
+    Returns:
+        The quantized model, or `None` if the weights could not be loaded.
+    """
+    model = _quantize_model(SentenceTransformer(model_name))
+    try:
+        state_dict = torch.load(path, weights_only=True)
+        model.load_state_dict(state_dict)
+    except (RuntimeError, pickle.UnpicklingError):
+        return None
+
+    return model
+
+
+def _get_accuracy(
+    verdicts: dict[tuple[str, str], bool],
+    labels: dict[tuple[str, str], bool],
+) -> float:
+    if len(verdicts) == 0:
+        return 0.0
+
+    return sum(verdict == labels[e] for e, verdict in verdicts.items()) / len(verdicts)
+
+
+def _save_index(index: dict[str, tuple[np.ndarray, np.ndarray]], path: Path) -> None:
+    arrays = {}
+    for entity_type, (vectors, labels) in index.items():
+        arrays[f"{entity_type}.vectors"] = vectors
+        arrays[f"{entity_type}.labels"] = labels
+
+    with path.open("wb") as f:
+        np.savez(f, **arrays)
+
+
+def _load_index(path: Path) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    index = {}
+    with np.load(path) as data:
+        for name in data.files:
+            entity_type, kind = name.rsplit(".", 1)
+            if kind == "vectors":
+                index[entity_type] = (data[name], data[f"{entity_type}.labels"])
+
+    return index
+
+
+def _get_cache_key(word: str, country: str | None) -> str:
+    return f"{country or ''}:{word.strip().lower()}"
+
+
+async def _get_definitions(
+    session: aiohttp.ClientSession,
+    word: str,
+    country: str | None,
+) -> list[str]:
     """Gets the definitions of a word from the Cambridge Dictionary.
 
     Args:
+        session: The HTTP session to use.
         word: The word to get the definitions of.
         country: The country code to use in the URL. If `None`, the defeault URL is
             used.
@@ -169,13 +918,15 @@ def _get_definitions(word: str, country: str | None) -> list[str]:
         url = f"https://dictionary.cambridge.org/dictionary/english/{word}"
     headers = Headers(headers=True).generate()
 
-    response = requests.get(url, headers=headers, allow_redirects=False, timeout=10)
-    response.raise_for_status()
-    if response.status_code != 200:
-        # the word is not in the dictionary
-        return []
+    async with session.get(url, headers=headers, allow_redirects=False) as response:
+        response.raise_for_status()
+        if response.status != 200:
+            # the word is not in the dictionary
+            return []
+
+        text = await response.text()
 
-    html = BeautifulSoup(response.text, "html.parser")
+    html = BeautifulSoup(text, "html.parser")
     divs = html.select(".def.ddef_d.db")
     return [div.get_text().strip(":\n ").replace("\n", " ") for div in divs]
 
@@ -3,9 +3,13 @@
 
 import logging
 import os
-from typing import Any
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Literal
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from rasa.engine.graph import ExecutionContext, GraphComponent
 from rasa.engine.recipes.default_recipe import DefaultV1Recipe
@@ -15,22 +19,53 @@ from rasa.shared.nlu.constants import METADATA, TEXT
 from rasa.shared.nlu.training_data.message import Message
 from rasa.shared.nlu.training_data.training_data import TrainingData
 
+from ._symspell import SymSpell
+
 _logger = logging.getLogger(__name__)
 _logger.setLevel(logging.DEBUG)
 
+_SYMSPELL_FILE = "symspell.json"
+
 
 @DefaultV1Recipe.register(
     component_types=DefaultV1Recipe.ComponentType.MESSAGE_FEATURIZER,
-    is_trainable=False,
+    is_trainable=True,
 )
 class SpellChecker(GraphComponent):
-    """Component that checks the spelling of the input message."""
+    """Component that checks the spelling of the input message.
+
+    Two backends are available:
+    - `bing`: the messages are checked by the Bing Spell Check API. They are checked
+      concurrently through a pool of HTTP connections and the corrections are
+      cached. If the checks do not complete within the time budget, the messages
+      still waiting for a correction are passed through unchanged.
+    - `symspell`: the messages are corrected locally by a SymSpell dictionary built
+      at training time from a frequency word list and the vocabulary of the
+      training data. To avoid replacing names and other words missing from the
+      dictionary, capitalized words and corrections that are not similar enough
+      to the original word are skipped.
+    """
 
     # ----------------------------------------------------------------------- #
     # Constructor and Factory Methods
     # ----------------------------------------------------------------------- #
 
-    def __init__(self, api_key: str, default_locale: str) -> None:
+    def __init__(
+        self,
+        *,
+        backend: Literal["bing", "symspell"],
+        default_locale: str,
+        model_storage: ModelStorage,
+        resource: Resource,
+        api_key: str | None = None,
+        max_concurrency: int = 8,
+        time_budget: float = 2.0,
+        cache_size: int = 1024,
+        symspell_config: dict[str, Any] | None = None,
+        min_similarity: float = 0.8,
+        ignore_capitalized: bool = True,
+        symspell: SymSpell | None = None,
+    ) -> None:
         super().__init__()
 
         if default_locale not in _LOCALES:
@@ -40,27 +75,116 @@ class SpellChecker(GraphComponent):
             )
             raise ValueError(msg)
 
-        self._api_key = api_key
+        self._backend = backend
         self._locale = default_locale
+        self._model_storage = model_storage
+        self._resource = resource
+
+        # symspell backend
+        self._symspell_config = symspell_config or {}
+        self._min_similarity = min_similarity
+        self._ignore_capitalized = ignore_capitalized
+        self._symspell = symspell
+
+        # bing backend
+        self._time_budget = time_budget
+        if backend == "bing":
+            if api_key is None:
+                msg = "The bing backend requires an API key."
+                raise ValueError(msg)
+
+            self._api_key = api_key
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+            self._session.mount("https://", adapter)
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_concurrency,
+                thread_name_prefix="spell-checker",
+            )
+
+        # the cache is also filled by the threads of the executor
+        self._cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
 
     @classmethod
     def create(
         cls,
         config: dict[str, Any],
-        model_storage: ModelStorage,  # noqa: ARG003
-        resource: Resource,  # noqa: ARG003
+        model_storage: ModelStorage,
+        resource: Resource,
         execution_context: ExecutionContext,  # noqa: ARG003
+        *,
+        symspell: SymSpell | None = None,
     ) -> GraphComponent:
-        api_key = os.environ.get(config["api_key_env_var"])
-        if api_key is None:
-            msg = (
-                f"Could not find an API key in the environment variable "
-                f"'{config['api_key_env_var']}'."
-            )
-            raise RuntimeError(msg)
-        locale = config["default_locale"]
+        backend = config["backend"]
+        api_key = None
+        match backend:
+            case "bing":
+                api_key = os.environ.get(config["api_key_env_var"])
+                if api_key is None:
+                    msg = (
+                        f"Could not find an API key in the environment variable "
+                        f"'{config['api_key_env_var']}'."
+                    )
+                    raise RuntimeError(msg)
+            case "symspell":
+                if config["frequency_list"] is None:
+                    # the training data alone does not cover the words of the users,
+                    # which would be replaced by the closest training words
+                    msg = "The symspell backend requires a 'frequency_list'."
+                    raise ValueError(msg)
+            case _:
+                msg = f"Unsupported spell checker backend '{backend}'."
+                raise ValueError(msg)
 
-        return cls(api_key, locale)
+        return cls(
+            backend=backend,
+            default_locale=config["default_locale"],
+            model_storage=model_storage,
+            resource=resource,
+            api_key=api_key,
+            max_concurrency=config["max_concurrency"],
+            time_budget=config["time_budget"],
+            cache_size=config["cache_size"],
+            symspell_config={
+                "frequency_list": config["frequency_list"],
+                "max_edit_distance": config["max_edit_distance"],
+                "prefix_length": config["prefix_length"],
+                "min_word_length": config["min_word_length"],
+            },
+            min_similarity=config["min_similarity"],
+            ignore_capitalized=config["ignore_capitalized"],
+            symspell=symspell,
+        )
+
+    @classmethod
+    def load(
+        cls,
+        config: dict[str, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+        **kwargs: Any,  # noqa: ARG003
+    ) -> GraphComponent:
+        symspell = None
+        if config["backend"] == "symspell":
+            try:
+                with model_storage.read_from(resource) as model_dir:
+                    symspell = SymSpell.load(model_dir / _SYMSPELL_FILE)
+            except (ValueError, FileNotFoundError):
+                _logger.warning(
+                    "Could not load the SymSpell dictionary, the spelling of the "
+                    "messages will not be checked."
+                )
+
+        return cls.create(
+            config,
+            model_storage,
+            resource,
+            execution_context,
+            symspell=symspell,
+        )
 
     # ----------------------------------------------------------------------- #
     # Public Methods
@@ -68,7 +192,7 @@ class SpellChecker(GraphComponent):
 
     @staticmethod
     def required_packages() -> list[str]:
-        return ["requests"]
+        return ["requests", "rapidfuzz"]
 
     @staticmethod
     def supported_languages() -> list[str] | None:
@@ -78,38 +202,159 @@ class SpellChecker(GraphComponent):
     @staticmethod
     def get_default_config() -> dict[str, Any]:
         return {
-            "api_key_env_var": "BING_SEARCH_V7_SUBSCRIPTION_KEY",
+            "backend": "bing",
             "default_locale": "en-US",
+            # bing backend
+            "api_key_env_var": "BING_SEARCH_V7_SUBSCRIPTION_KEY",
+            "max_concurrency": 8,
+            "time_budget": 2.0,
+            "cache_size": 1024,
+            # symspell backend
+            "frequency_list": None,
+            "max_edit_distance": 2,
+            "prefix_length": 7,
+            "min_word_length": 3,
+            "min_similarity": 0.8,
+            "ignore_capitalized": True,
         }
 
+    def train(self, training_data: TrainingData) -> Resource:
+        if self._backend != "symspell":
+            return self._resource
+
+        texts = [
+            message.get(TEXT)
+            for message in training_data.training_examples
+            if message.get(TEXT)
+        ]
+        for table in training_data.lookup_tables:
+            elements = table.get("elements")
+            if isinstance(elements, list):
+                texts.extend(str(element) for element in elements)
+
+        config = self._symspell_config.copy()
+        frequency_list = config.pop("frequency_list")
+        self._symspell = SymSpell.from_texts(texts, frequency_list, **config)
+
+        with self._model_storage.write_to(self._resource) as model_dir:
+            self._symspell.save(model_dir / _SYMSPELL_FILE)
+
+        return self._resource
+
     def process_training_data(self, training_data: TrainingData) -> TrainingData:
         return training_data
 
     def process(self, messages: list[Message]) -> list[Message]:
-        for message in messages:
-            medadata = message.get(METADATA) or {}
-            locale = medadata.get("locale")
-            if locale is not None:
-                if locale not in _LOCALES:
-                    msg = f"Unsupported locale '{locale}'."
-                    raise ValueError(msg)
-            else:
-                locale = self._locale
+        if self._backend == "symspell":
+            return self._process_locally(messages)
 
+        return self._process_remotely(messages)
+
+    # ----------------------------------------------------------------------- #
+    # Private Methods
+    # ----------------------------------------------------------------------- #
+
+    def _process_locally(self, messages: list[Message]) -> list[Message]:
+        if self._symspell is None:
+            return messages
+
+        for message in messages:
             text = message.get(TEXT)
             if text is not None:
-                text = _check_spelling(text, self._api_key, locale)
-                message.set(TEXT, text)
+                corrected = self._symspell.correct(
+                    text,
+                    min_similarity=self._min_similarity,
+                    ignore_capitalized=self._ignore_capitalized,
+                )
+                message.set(TEXT, corrected)
+
+        return messages
+
+    def _process_remotely(self, messages: list[Message]) -> list[Message]:
+        # messages with the same text and locale share the same request
+        pending: dict[tuple[str, str], list[Message]] = {}
+        for message in messages:
+            text = message.get(TEXT)
+            if text is None:
+                continue
+
+            locale = self._get_locale(message)
+            corrected = self._get_cached(text, locale)
+            if corrected is not None:
+                message.set(TEXT, corrected)
+            else:
+                pending.setdefault((text, locale), []).append(message)
+
+        if not pending:
+            return messages
+
+        futures = {
+            self._executor.submit(self._check_spelling, text, locale): (text, locale)
+            for text, locale in pending
+        }
+        done, not_done = wait(futures, timeout=self._time_budget)
+        for future in done:
+            try:
+                corrected = future.result()
+            except Exception:
+                _logger.exception("Could not check the spelling of the message.")
+                continue
+
+            for message in pending[futures[future]]:
+                message.set(TEXT, corrected)
+
+        if not_done:
+            # the requests keep running in the background and fill the cache
+            _logger.warning(
+                "The spelling of %d messages could not be checked within %.2f "
+                "seconds, they are passed through unchanged.",
+                sum(len(pending[futures[future]]) for future in not_done),
+                self._time_budget,
+            )
 
         return messages
 
+    def _get_locale(self, message: Message) -> str:
+        medadata = message.get(METADATA) or {}
+        locale = medadata.get("locale")
+        if locale is None:
+            return self._locale
+        if locale not in _LOCALES:
+            msg = f"Unsupported locale '{locale}'."
+            raise ValueError(msg)
+
+        return locale
+
+    def _check_spelling(self, text: str, locale: str) -> str:
+        corrected = _check_spelling(self._session, text, self._api_key, locale)
+        with self._cache_lock:
+            self._cache[text, locale] = corrected
+            self._cache.move_to_end((text, locale))
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return corrected
+
+    def _get_cached(self, text: str, locale: str) -> str | None:
+        with self._cache_lock:
+            corrected = self._cache.get((text, locale))
+            if corrected is not None:
+                self._cache.move_to_end((text, locale))
+
+        return corrected
+
 
 # --------------------------------------------------------------------------- #
 # Private API
 # --------------------------------------------------------------------------- #
 
 
-def _check_spelling(text: str, api_key: str, locale: str) -> str:
+def _check_spelling(
+    session: requests.Session,
+    text: str,
+    api_key: str,
+    locale: str,
+) -> str:
     endpoint = "https://api.bing.microsoft.com/v7.0/spellcheck"
     headers = {
         "Content-Type": "application/x-www-form-urlencoded",
@@ -118,7 +363,7 @@ def _check_spelling(text: str, api_key: str, locale: str) -> str:
     params = {"mode": "proof", "mkt": locale}
     data = {"text": text}
 
-    response = requests.post(
+    response = session.post(
         endpoint,
         headers=headers,
         params=params,
@@ -0,0 +1,230 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+import itertools
+import json
+import re
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from rapidfuzz.distance import OSA
+
+_WORD_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+
+
+class SymSpell:
+    """Spelling corrector based on the Symmetric Delete algorithm.
+
+    Every word of the dictionary is indexed by all the strings obtained by deleting
+    up to `max_edit_distance` characters from its prefix. To correct a word, the
+    same deletes are generated from it and looked up in the index, so that the
+    candidates are found without enumerating the whole dictionary nor generating
+    insertions, substitutions and transpositions.
+    """
+
+    def __init__(
+        self,
+        words: dict[str, int],
+        max_edit_distance: int = 2,
+        prefix_length: int = 7,
+        min_word_length: int = 3,
+    ) -> None:
+        """Initializes the corrector and builds the delete index.
+
+        Args:
+            words: The dictionary of correct words with their frequency.
+            max_edit_distance: The maximum edit distance between a word and its
+                correction.
+            prefix_length: The length of the prefix of the words used to build the
+                index. Longer prefixes make the index larger but the lookups faster.
+            min_word_length: Words shorter than this are never corrected.
+        """
+        if prefix_length <= max_edit_distance:
+            msg = "The prefix length must be greater than the maximum edit distance."
+            raise ValueError(msg)
+
+        self._words = words
+        self._max_edit_distance = max_edit_distance
+        self._prefix_length = prefix_length
+        self._min_word_length = min_word_length
+
+        self._deletes: dict[str, list[str]] = {}
+        for word in words:
+            for delete in self._get_deletes(word):
+                self._deletes.setdefault(delete, []).append(word)
+
+    # ----------------------------------------------------------------------- #
+    # Factory methods
+    # ----------------------------------------------------------------------- #
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: Iterable[str],
+        frequency_list: str | Path | None = None,
+        **kwargs: Any,
+    ) -> "SymSpell":
+        """Creates a corrector whose dictionary contains the words of the texts.
+
+        Args:
+            texts: The texts whose words are added to the dictionary.
+            frequency_list: The path to a file with additional words, one per line,
+                optionally followed by their frequency (separated by a space).
+            **kwargs: Additional arguments passed to the constructor.
+
+        Returns:
+            The corrector.
+        """
+        words: Counter[str] = Counter()
+        for text in texts:
+            words.update(match.lower() for match in _WORD_PATTERN.findall(text))
+
+        if frequency_list is not None:
+            with Path(frequency_list).open(encoding="utf-8") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 0:
+                        continue
+                    count = int(parts[1]) if len(parts) > 1 else 1
+                    words[parts[0].lower()] += count
+
+        return cls(dict(words), **kwargs)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SymSpell":
+        """Loads a corrector saved with `save`, building its delete index again."""
+        with Path(path).open(encoding="utf-8") as f:
+            data = json.load(f)
+
+        return cls(
+            data["words"],
+            max_edit_distance=data["max_edit_distance"],
+            prefix_length=data["prefix_length"],
+            min_word_length=data["min_word_length"],
+        )
+
+    # ----------------------------------------------------------------------- #
+    # Public methods
+    # ----------------------------------------------------------------------- #
+
+    def save(self, path: str | Path) -> None:
+        """Saves the dictionary and the parameters of the corrector to a file.
+
+        The delete index is many times larger than the dictionary, so it is not
+        saved and it is built again by `load`.
+        """
+        data = {
+            "words": self._words,
+            "max_edit_distance": self._max_edit_distance,
+            "prefix_length": self._prefix_length,
+            "min_word_length": self._min_word_length,
+        }
+        with Path(path).open("w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def lookup(self, word: str) -> str | None:
+        """Returns the most likely correction of a word.
+
+        Among the words of the dictionary within the maximum edit distance, the
+        closest one is returned, breaking ties by frequency.
+
+        Args:
+            word: The (lowercase) word to correct.
+
+        Returns:
+            The correction, the word itself if it is in the dictionary, or `None`
+            if no correction was found.
+        """
+        result = self._find(word)
+        return result[0] if result is not None else None
+
+    def correct(
+        self,
+        text: str,
+        *,
+        min_similarity: float = 0.0,
+        ignore_capitalized: bool = False,
+    ) -> str:
+        """Corrects the spelling of the words of a text.
+
+        Words that are too short, that are in the dictionary or for which no
+        correction is found are left unchanged, as well as punctuation and spacing.
+        The capitalization of the first letter of each word is preserved.
+
+        Args:
+            text: The text to correct.
+            min_similarity: The minimum similarity between a word and its
+                correction, computed as one minus their edit distance divided by
+                the length of the word. Less similar corrections are discarded, so
+                that short words missing from the dictionary (e.g. names) are not
+                replaced by unrelated ones.
+            ignore_capitalized: Whether to leave capitalized words unchanged, since
+                they are usually proper nouns missing from the dictionary.
+
+        Returns:
+            The corrected text.
+        """
+
+        def replace(match: re.Match[str]) -> str:
+            token = match.group()
+            if len(token) < self._min_word_length:
+                return token
+            if ignore_capitalized and token[0].isupper():
+                return token
+
+            result = self._find(token.lower())
+            if result is None or result[1] == 0:
+                return token
+
+            correction, distance = result
+            if 1 - distance / len(token) < min_similarity:
+                return token
+            if token[0].isupper():
+                return correction[0].upper() + correction[1:]
+            return correction
+
+        return _WORD_PATTERN.sub(replace, text)
+
+    # ----------------------------------------------------------------------- #
+    # Private methods
+    # ----------------------------------------------------------------------- #
+
+    def _find(self, word: str) -> tuple[str, int] | None:
+        if word in self._words:
+            return word, 0
+
+        best, best_distance, best_count = None, self._max_edit_distance + 1, 0
+        seen = set()
+        for delete in self._get_deletes(word):
+            for candidate in self._deletes.get(delete, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+
+                distance = OSA.distance(
+                    word, candidate, score_cutoff=self._max_edit_distance
+                )
+                if distance > self._max_edit_distance:
+                    continue
+
+                count = self._words[candidate]
+                if distance < best_distance or (
+                    distance == best_distance and count > best_count
+                ):
+                    best, best_distance, best_count = candidate, distance, count
+
+        return (best, best_distance) if best is not None else None
+
+    def _get_deletes(self, word: str) -> set[str]:
+        prefix = word[: self._prefix_length]
+        deletes = {prefix}
+        max_deletes = min(self._max_edit_distance, len(prefix) - 1)
+        for n in range(1, max_deletes + 1):
+            for indices in itertools.combinations(range(len(prefix)), n):
+                deletes.add(
+                    "".join(c for i, c in enumerate(prefix) if i not in indices)
+                )
+
+        return deletes
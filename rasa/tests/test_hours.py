@@ -0,0 +1,86 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the index of the opening hours.
+
+Run from the `rasa` directory with `python -m pytest tests`.
+"""
+
+from datetime import datetime, time, timedelta, timezone
+from types import SimpleNamespace
+
+from actions.utils import OpeningHoursIndex, get_open_mask
+
+# 2024-01-01 is a Monday
+_MONDAY = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_SUNDAY = datetime(2024, 1, 7, tzinfo=timezone.utc)
+
+
+def _late_sunday_index() -> OpeningHoursIndex:
+    # open only on Sunday from 22:00 to 02:00
+    periods: list[list] = [[] for _ in range(7)]
+    periods[6] = [(time(22), time(2))]
+    return OpeningHoursIndex(periods)
+
+
+def test_sunday_period_is_open_on_monday() -> None:
+    index = _late_sunday_index()
+
+    assert index.is_open_at(_MONDAY.replace(minute=30))
+    assert index.is_open_at(_SUNDAY.replace(hour=23))
+    assert not index.is_open_at(_MONDAY.replace(hour=2))
+    assert not index.is_open_at(_SUNDAY.replace(hour=21))
+
+
+def test_sunday_period_is_open_during_monday() -> None:
+    index = _late_sunday_index()
+
+    assert index.is_open_during(_MONDAY, _MONDAY.replace(hour=1))
+    assert index.is_open_during(_SUNDAY.replace(hour=23), _MONDAY.replace(hour=1))
+    assert not index.is_open_during(_MONDAY.replace(hour=1), _MONDAY.replace(hour=3))
+
+
+def test_sunday_period_next_opening() -> None:
+    index = _late_sunday_index()
+
+    monday = _MONDAY.replace(minute=30)
+    assert index.get_next_opening(monday) == monday
+    assert index.get_next_opening(_MONDAY.replace(hour=3)) == _SUNDAY.replace(hour=22)
+    assert index.get_next_opening(_SUNDAY.replace(hour=23)) == _SUNDAY.replace(hour=23)
+
+
+def test_sunday_period_open_intervals() -> None:
+    index = _late_sunday_index()
+
+    start, end = _MONDAY, _MONDAY.replace(hour=12)
+    assert index.get_open_intervals(start, end) == [(start, _MONDAY.replace(hour=2))]
+
+
+def test_queries_agree_with_day_periods() -> None:
+    index = _late_sunday_index()
+
+    assert index.get_day_periods(0) == [(None, time(2))]
+    assert index.get_day_periods(6) == [(time(22), None)]
+    for wd in range(7):
+        day = _MONDAY + timedelta(days=wd)
+        for hour in range(24):
+            dt = day.replace(hour=hour)
+            is_open = any(
+                (s is None or time(hour) >= s) and (e is None or time(hour) < e)
+                for s, e in index.get_day_periods(wd)
+            )
+            assert index.is_open_at(dt) == is_open, dt
+
+
+def test_sunday_period_open_mask() -> None:
+    hours = SimpleNamespace(periods=[[] for _ in range(6)] + [[(time(22), time(2))]])
+    place = SimpleNamespace(regular_opening_hours=hours)
+    closed = SimpleNamespace(regular_opening_hours=None)
+
+    mask = get_open_mask([place, closed], _MONDAY.replace(minute=30), _MONDAY)
+    assert mask.tolist() == [True, False]
+    start = _SUNDAY.replace(hour=23)
+    mask = get_open_mask([place], start, start + timedelta(hours=2))
+    assert mask.tolist() == [True]
+    mask = get_open_mask([place], start, start + timedelta(hours=4))
+    assert mask.tolist() == [False]
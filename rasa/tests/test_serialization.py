@@ -0,0 +1,102 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Round-trip tests for the serialization of places.
+
+Run from the `rasa` directory with `python -m pytest tests`.
+"""
+
+import dataclasses
+import json
+import random
+from datetime import time
+
+import pytest
+import serde
+from gcp.maps import places
+
+from actions import utils
+
+_NUM_PLACES = 200
+_BOOLEAN_FIELDS = [
+    "allows_dogs",
+    "good_for_children",
+    "menu_for_children",
+    "outdoor_seating",
+    "reservable",
+    "restroom",
+    "serves_vegetarian_food",
+    "takeout",
+]
+
+
+def _random_time(rng: random.Random) -> time | None:
+    if rng.random() < 0.1:
+        return None
+    return time(rng.randrange(24), rng.choice([0, 15, 30, 45]))
+
+
+def _random_lat_lng(rng: random.Random) -> dict[str, float]:
+    return {"latitude": rng.uniform(-90, 90), "longitude": rng.uniform(-180, 180)}
+
+
+def _random_place(seed: int) -> places.Place:
+    rng = random.Random(seed)
+    fields: dict[str, object] = {
+        name: rng.choice([True, False, None]) for name in _BOOLEAN_FIELDS
+    }
+    fields |= {
+        "short_formatted_address": f"Via Roma, {rng.randrange(1, 200)}, Trento",
+        "national_phone_number": rng.choice([None, f"0461 {rng.randrange(10**6)}"]),
+        "website_uri": rng.choice([None, f"https://example.com/{seed}"]),
+        "rating": rng.choice([None, round(rng.uniform(1, 5), 1)]),
+        "price_level": rng.choice([None, *places.PriceLevel]),
+        "location": places.LatLng(rng.uniform(-90, 90), rng.uniform(-180, 180)),
+    }
+    # the nested fields are built by the generic decoder, so that they do not
+    # depend on the one under test
+    nested = {
+        "display_name": {"text": f"Place {seed}", "language_code": "en"},
+        "primary_type_display_name": rng.choice([
+            None,
+            {"text": "Restaurant", "language_code": "en"},
+        ]),
+        "viewport": rng.choice([
+            None,
+            {"low": _random_lat_lng(rng), "high": _random_lat_lng(rng)},
+        ]),
+        "parking_options": rng.choice([None, {"free_street_parking": True}]),
+        "payment_options": rng.choice([None, {"accepts_cash_only": False}]),
+    }
+    nested = {k: v for k, v in nested.items() if v is not None}
+    if rng.random() < 0.8:
+        periods = [
+            [(_random_time(rng), _random_time(rng)) for _ in range(rng.randrange(3))]
+            for _ in range(7)
+        ]
+        descriptions = [f"day {wd}" for wd in range(7)]
+        fields["regular_opening_hours"] = places.OpeningHours(periods, descriptions)
+
+    base = serde.from_dict(places.Place, nested)
+    return dataclasses.replace(base, **fields)
+
+
+@pytest.mark.parametrize("seed", range(_NUM_PLACES))
+def test_place_round_trip(seed: int) -> None:
+    place = _random_place(seed)
+
+    # the slots are sent as JSON with the tracker
+    data = json.loads(json.dumps(utils.serialize(place)))
+    assert utils.deserialize(places.Place, data) == place
+
+
+@pytest.mark.parametrize("seed", range(_NUM_PLACES))
+def test_place_round_trip_is_memoized(seed: int) -> None:
+    place = _random_place(seed)
+    data = json.loads(json.dumps(utils.serialize(place)))
+
+    with utils.memoize_deserialization():
+        first = utils.deserialize(places.Place, data)
+        assert utils.deserialize(places.Place, data) is first
+
+    assert first == place
@@ -0,0 +1,35 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Helpers shared by the benchmark scripts."""
+
+import re
+import sys
+from pathlib import Path
+
+import yaml
+
+RASA_DIR = Path(__file__).resolve().parents[1] / "rasa"
+
+# annotated entities, e.g. "[now](datetime)" or '[pizza]{"entity": "cuisine"}'
+_ENTITY_PATTERN = re.compile(r"\[([^\]]*)\](?:\([^)]*\)|\{[^}]*\})")
+
+
+def add_rasa_dir_to_path() -> None:
+    """Makes the `actions` and `components` packages importable."""
+    if str(RASA_DIR) not in sys.path:
+        sys.path.insert(0, str(RASA_DIR))
+
+
+def load_nlu_examples() -> list[str]:
+    """Returns the texts of the NLU training examples, without annotations."""
+    texts = []
+    for path in sorted((RASA_DIR / "data").glob("*_nlu.yml")):
+        data = yaml.safe_load(path.read_text())
+        for item in data.get("nlu", []):
+            for line in item.get("examples", "").splitlines():
+                line = line.strip().removeprefix("- ")  # noqa: PLW2901
+                if line:
+                    texts.append(_ENTITY_PATTERN.sub(r"\1", line))
+
+    return texts
@@ -0,0 +1,73 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Measures the cost of inflecting words with and without the shared engine.
+
+The reference implementation creates a new inflect engine on every call, as the
+grammar utilities did before the engine was shared and the inflections memoized.
+
+Usage:
+    python scripts/bench_grammar.py [--repeat 1000]
+"""
+
+import argparse
+import timeit
+from collections.abc import Callable
+
+import _corpus
+import inflect
+
+_corpus.add_rasa_dir_to_path()
+
+from actions.utils._grammar import pluralize, singularize  # noqa: E402
+
+# the words inflected by the actions (entity types and place types)
+_WORDS = ["search", "searches", "booking", "bookings", "result", "results", "one"]
+_WORDS += ["restaurant", "bar", "pub", "cafe", "bakery", "place", "places"]
+
+
+def _reference_singularize(word: str) -> str:
+    singular = inflect.engine().singular_noun(word)  # type: ignore
+    return word if singular is False else singular
+
+
+def _reference_pluralize(word: str) -> str:
+    engine = inflect.engine()
+    if engine.singular_noun(word) is False:  # type: ignore
+        return engine.plural_noun(word)  # type: ignore
+    return word
+
+
+def _run(
+    singular: Callable[[str], str],
+    plural: Callable[[str], str],
+    repeat: int,
+) -> float:
+    def inflect_all() -> None:
+        for word in _WORDS:
+            singular(word)
+            plural(word)
+
+    seconds = timeit.timeit(inflect_all, number=repeat)
+    return seconds / (repeat * 2 * len(_WORDS)) * 1e6
+
+
+def _main(repeat: int) -> None:
+    for word in _WORDS:
+        inflections = (singularize(word), pluralize(word))
+        if inflections != (_reference_singularize(word), _reference_pluralize(word)):
+            msg = f"The inflections of '{word}' differ from the reference."
+            raise RuntimeError(msg)
+
+    reference = _run(_reference_singularize, _reference_pluralize, repeat)
+    current = _run(singularize, pluralize, repeat)
+    print(f"new engine per call:   {reference:.2f} us/inflection")
+    print(f"shared and memoized:   {current:.2f} us/inflection")
+    print(f"speed-up:              {reference / current:.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+    _main(args.repeat)
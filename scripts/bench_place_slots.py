@@ -0,0 +1,180 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Compares the slots holding whole places with the ones referencing stored places.
+
+For a place with all the fields requested for the search results, it reports the
+size of the JSON payload of the slot (which is sent with the tracker at every turn)
+and the time needed to serialize and deserialize the slot in both forms. The
+compact form is deserialized from the in-memory key-value store. The decoder of
+the whole place is also compared, without the JSON parsing, with the generic
+decoder of `serde` on the same payload.
+
+It also reports the latency of a whole action request, with the place in the
+`search_location`, `user_location` and `booking_place` slots (and in the events
+that set them): the request is decoded from JSON, the `action_create_booking`
+action is run on its tracker and the response is encoded to JSON, as the action
+server does.
+
+Usage:
+    python scripts/bench_place_slots.py [--place path/to/place.json] [--repeat 1000]
+
+The place file must contain a place serialized with `utils.serialize`. If it is
+not given, a typical restaurant is used.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import _corpus
+
+_corpus.add_rasa_dir_to_path()
+
+from actions import CreateBooking, utils  # noqa: E402
+from actions.utils._misc import _decode_place_generic  # noqa: E402
+from gcp.maps import places  # noqa: E402
+from rasa_sdk import Tracker  # noqa: E402
+from rasa_sdk.executor import CollectingDispatcher  # noqa: E402
+
+_PLACE_SLOTS = ["search_location", "user_location", "booking_place"]
+_HOURS = [["12:00:00", "15:00:00"], ["19:00:00", "23:30:00"]]
+_SAMPLE_PLACE: dict[str, Any] = {
+    "display_name": {"text": "Trattoria da Mario", "language_code": "it"},
+    "location": {"latitude": 46.0679, "longitude": 11.1211},
+    "primary_type_display_name": {"text": "Italian Restaurant", "language_code": "en"},
+    "short_formatted_address": "Via Roma, 12, Trento",
+    "national_phone_number": "0461 123456",
+    "price_level": "PRICE_LEVEL_MODERATE",
+    "rating": 4.5,
+    "website_uri": "https://www.trattoriadamario.it/",
+    "allows_dogs": True,
+    "good_for_children": True,
+    "menu_for_children": False,
+    "outdoor_seating": True,
+    "reservable": True,
+    "restroom": True,
+    "serves_vegetarian_food": True,
+    "takeout": False,
+    "regular_opening_hours": {
+        "periods": [[], *[_HOURS for _ in range(6)]],
+        "weekday_descriptions": [
+            "Mon: Closed",
+            *[
+                f"{day}: 12:00 - 3:00 PM, 7:00 - 11:30 PM"
+                for day in ["Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+            ],
+        ],
+    },
+}
+
+
+def _measure(repeat: int, func: Any) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def _measure_async(repeat: int, func: Any) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def _build_request(slot: dict[str, Any]) -> str:
+    slots = {
+        **dict.fromkeys(_PLACE_SLOTS, slot),
+        "booking_history": [None],
+        "selected_bookings": [0],
+        "booking_datetime": "2024-01-02T20:00:00",
+        "booking_people_count": 2,
+        "booking_author": "Mario",
+    }
+    events = [
+        {"event": "slot", "name": name, "value": value} for name, value in slots.items()
+    ]
+    tracker = {
+        "sender_id": "bench",
+        "slots": slots,
+        "latest_message": {"intent": {"name": "affirm"}, "entities": []},
+        "events": events,
+        "active_loop": {},
+    }
+    return json.dumps({"next_action": "action_create_booking", "tracker": tracker})
+
+
+async def _handle_request(action: CreateBooking, body: str) -> str:
+    request = json.loads(body)
+    tracker = Tracker.from_dict(request["tracker"])
+    dispatcher = CollectingDispatcher()
+    events = await action.run(dispatcher, tracker, request.get("domain", {}))
+    return json.dumps({"events": events, "responses": dispatcher.messages})
+
+
+def _main(args: argparse.Namespace) -> None:
+    data = json.loads(Path(args.place).read_text()) if args.place else _SAMPLE_PLACE
+    place = utils.deserialize(places.Place, data)
+
+    whole = utils.serialize(place)
+    compact = utils.serialize_place(place)
+    # the slots are sent as JSON with the tracker
+    whole_size = len(json.dumps(whole).encode())
+    compact_size = len(json.dumps(compact).encode())
+
+    serialize_whole = _measure(args.repeat, lambda: utils.serialize(place))
+    serialize_compact = _measure(args.repeat, lambda: utils.serialize_place(place))
+    # a new dictionary each time, so that the memoization does not apply
+    deserialize_whole = _measure(
+        args.repeat,
+        lambda: utils.deserialize(places.Place, json.loads(json.dumps(whole))),
+    )
+    # the decoders alone, on the same payload (the memoization is not active
+    # outside of a request)
+    payload = json.loads(json.dumps(whole))
+    decode_slots = _measure(
+        args.repeat, lambda: utils.deserialize(places.Place, payload)
+    )
+    decode_serde = _measure(args.repeat, lambda: _decode_place_generic(payload))
+    deserialize_compact = asyncio.run(
+        _measure_async(
+            args.repeat,
+            lambda: utils.deserialize_place(json.loads(json.dumps(compact))),
+        )
+    )
+
+    action = CreateBooking()
+    whole_request = _build_request(whole)
+    compact_request = _build_request(compact)
+    request_whole = asyncio.run(
+        _measure_async(args.repeat, lambda: _handle_request(action, whole_request))
+    )
+    request_compact = asyncio.run(
+        _measure_async(args.repeat, lambda: _handle_request(action, compact_request))
+    )
+
+    print("                      whole place   compact")
+    print(f"slot size (bytes):    {whole_size:>11}   {compact_size:>7}")
+    print(f"serialize (us):       {serialize_whole:>11.1f}   {serialize_compact:>7.1f}")
+    print(
+        f"deserialize (us):     {deserialize_whole:>11.1f}   "
+        f"{deserialize_compact:>7.1f}"
+    )
+    print(f"decode (us):          {decode_slots:>11.1f}         -")
+    print(f"decode, serde (us):   {decode_serde:>11.1f}         -")
+    print(
+        f"request size (bytes): {len(whole_request.encode()):>11}   "
+        f"{len(compact_request.encode()):>7}"
+    )
+    print(f"request (us):         {request_whole:>11.1f}   {request_compact:>7.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--place", help="JSON file with a serialized place.")
+    parser.add_argument("--repeat", type=int, default=1000)
+    _main(parser.parse_args())
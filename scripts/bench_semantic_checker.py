@@ -0,0 +1,141 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Measures the throughput of the SemanticChecker with and without batching.
+
+The same messages, each with one entity to check, are processed one at a time
+(as if each came in its own request) and all together in a single call. Every
+run starts from a new component sharing the same model, so that no embedding or
+verdict is reused between runs. In the `dictionary` mode, the definitions are
+retrieved before the runs, so that the network is not measured.
+
+Usage:
+    python scripts/bench_semantic_checker.py [--classifier knn] [--messages 256]
+"""
+
+import argparse
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import _corpus
+import yaml
+
+_corpus.add_rasa_dir_to_path()
+
+from components import SemanticChecker  # noqa: E402
+from components._semantic_checker import _DefinitionCache  # noqa: E402
+from rasa.engine.graph import ExecutionContext, GraphSchema  # noqa: E402
+from rasa.engine.storage.local_model_storage import LocalModelStorage  # noqa: E402
+from rasa.engine.storage.resource import Resource  # noqa: E402
+from rasa.shared.nlu.constants import (  # noqa: E402
+    ENTITIES,
+    ENTITY_ATTRIBUTE_END,
+    ENTITY_ATTRIBUTE_START,
+    ENTITY_ATTRIBUTE_TYPE,
+    ENTITY_ATTRIBUTE_VALUE,
+    TEXT,
+)
+from rasa.shared.nlu.training_data.message import Message  # noqa: E402
+from rasa.shared.nlu.training_data.training_data import TrainingData  # noqa: E402
+from sentence_transformers import SentenceTransformer  # noqa: E402
+
+_ENTITY_TYPE = "place_type"
+
+
+def _load_config(classifier: str) -> dict[str, Any]:
+    pipeline = yaml.safe_load((_corpus.RASA_DIR / "config.yml").read_text())
+    entry = next(
+        item
+        for item in pipeline["pipeline"]
+        if item["name"] == "components.SemanticChecker"
+    )
+    config = {**SemanticChecker.get_default_config(), **entry}
+    config.pop("name")
+    config["classifier"] = classifier
+    return config
+
+
+def _load_values(config: dict[str, Any]) -> list[str]:
+    pattern = re.compile(rf"\[([^\]]+)\]\({_ENTITY_TYPE}\)")
+    values = set()
+    for path in (_corpus.RASA_DIR / "data").glob("*_nlu.yml"):
+        values.update(pattern.findall(path.read_text()))
+    for entity in config["entities"]:
+        values.update(entity.get("positives", []))
+        values.update(entity.get("negatives", []))
+
+    return sorted(values)
+
+
+def _build_messages(values: list[str], count: int, seed: int) -> list[Message]:
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        value = rng.choice(values)
+        text = f"find a {value} near me"
+        entity = {
+            ENTITY_ATTRIBUTE_TYPE: _ENTITY_TYPE,
+            ENTITY_ATTRIBUTE_VALUE: value,
+            ENTITY_ATTRIBUTE_START: 7,
+            ENTITY_ATTRIBUTE_END: 7 + len(value),
+        }
+        messages.append(Message(data={TEXT: text, ENTITIES: [entity]}))
+
+    return messages
+
+
+def _main(args: argparse.Namespace) -> None:
+    config = _load_config(args.classifier)
+    model = SentenceTransformer(config["model_name"])
+    definitions = _DefinitionCache(config["cache_size"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalModelStorage(Path(tmp))
+        context = ExecutionContext(GraphSchema({}))
+
+        def create() -> SemanticChecker:
+            resource = Resource(f"semantic_checker_{time.monotonic_ns()}")
+            component = SemanticChecker.create(
+                config,
+                storage,
+                resource,
+                context,
+                definitions=definitions,
+                model=model,
+            )
+            component.train(TrainingData())  # type: ignore
+            return component  # type: ignore
+
+        values = _load_values(config)
+        # retrieve the definitions (and load the model) before measuring
+        create().process(_build_messages(values, len(values), args.seed))
+
+        component = create()
+        messages = _build_messages(values, args.messages, args.seed)
+        start = time.perf_counter()
+        for message in messages:
+            component.process([message])
+        sequential = time.perf_counter() - start
+
+        component = create()
+        messages = _build_messages(values, args.messages, args.seed)
+        start = time.perf_counter()
+        component.process(messages)
+        batched = time.perf_counter() - start
+
+    print(f"classifier:            {args.classifier}")
+    print(f"distinct values:       {len(values)}")
+    print(f"one message per call:  {args.messages / sequential:.1f} messages/s")
+    print(f"all messages at once:  {args.messages / batched:.1f} messages/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classifier", choices=["dictionary", "knn"], default="knn")
+    parser.add_argument("--messages", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    _main(parser.parse_args())
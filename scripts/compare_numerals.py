@@ -0,0 +1,77 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Compares the local numeral parser with Duckling on the NLU training examples.
+
+For every example, the numbers and ordinals found by `parse_numerals` are compared
+with the ones returned by Duckling, and the time needed by both is measured. The
+examples the local parser declines (and that are therefore sent to Duckling) are
+counted separately.
+
+Usage:
+    python scripts/compare_numerals.py [--url http://localhost:8000/parse]
+
+A Duckling server must be running at the given URL.
+"""
+
+import argparse
+import asyncio
+import time
+
+import _corpus
+
+_corpus.add_rasa_dir_to_path()
+
+from actions.utils._numerals import parse_numerals  # noqa: E402
+from actions.utils._parsing import DUCKLING_URL, DucklingClient  # noqa: E402
+
+
+async def _parse_with_duckling(
+    client: DucklingClient,
+    text: str,
+) -> tuple[list[int], list[int]]:
+    entities = await client.parse(text, "en_US", ["number", "ordinal"])
+    numbers = [int(e["value"]["value"]) for e in entities if e["dim"] == "number"]
+    ordinals = [int(e["value"]["value"]) for e in entities if e["dim"] == "ordinal"]
+    return numbers, ordinals
+
+
+async def _main(url: str) -> None:
+    texts = _corpus.load_nlu_examples()
+    client = DucklingClient(url)
+
+    local_time = 0.0
+    remote_time = 0.0
+    declined = 0
+    mismatches = []
+    try:
+        for text in texts:
+            start = time.perf_counter()
+            local = parse_numerals(text)
+            local_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            remote = await _parse_with_duckling(client, text)
+            remote_time += time.perf_counter() - start
+
+            if local is None:
+                declined += 1
+            elif local != remote:
+                mismatches.append((text, local, remote))
+    finally:
+        await client.close()
+
+    print(f"examples:            {len(texts)}")
+    print(f"declined locally:    {declined}")
+    print(f"mismatches:          {len(mismatches)}")
+    print(f"local latency:       {local_time / len(texts) * 1e6:.1f} us/example")
+    print(f"Duckling latency:    {remote_time / len(texts) * 1e3:.2f} ms/example")
+    for text, local, remote in mismatches:
+        print(f"- {text!r}: local={local} duckling={remote}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=DUCKLING_URL, help="Duckling parse URL.")
+    args = parser.parse_args()
+    asyncio.run(_main(args.url))
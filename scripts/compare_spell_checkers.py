@@ -0,0 +1,128 @@
+# Copyright 2024 Francesco Gentile.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Compares the accuracy and latency of the spell checker backends.
+
+The NLU training examples are split in two: the SymSpell dictionary is built from
+the frequency list and the first part, while the second part is used for the
+evaluation. Each evaluation example is checked three times:
+- with a random typo in one of its words, counting how many typos are fixed;
+- unchanged, counting how many correct texts are modified;
+- with a name or cuisine appended, counting how many of them are altered.
+
+The Bing backend is evaluated only if its subscription key is set, on at most
+`--bing-limit` examples to bound the cost of the requests.
+
+Usage:
+    python scripts/compare_spell_checkers.py --frequency-list path/to/words.txt
+"""
+
+import argparse
+import os
+import random
+import string
+import time
+from collections.abc import Callable
+
+import _corpus
+import requests
+
+_corpus.add_rasa_dir_to_path()
+
+from components._spell_checker import _check_spelling  # noqa: E402
+from components._symspell import SymSpell  # noqa: E402
+
+_PROPER_WORDS = ["Mark", "Luca", "Sara", "Francesco", "thai", "sushi", "ramen"]
+
+
+def _add_typo(text: str, rng: random.Random) -> str:
+    words = text.split()
+    candidates = [i for i, word in enumerate(words) if word.isalpha() and len(word) > 4]
+    if not candidates:
+        return text
+
+    idx = rng.choice(candidates)
+    word = words[idx]
+    pos = rng.randrange(1, len(word) - 1)
+    match rng.randrange(4):
+        case 0:
+            word = word[:pos] + word[pos + 1 :]
+        case 1:
+            word = word[:pos] + rng.choice(string.ascii_lowercase) + word[pos:]
+        case 2:
+            word = word[:pos] + rng.choice(string.ascii_lowercase) + word[pos + 1 :]
+        case _:
+            word = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2 :]
+
+    words[idx] = word
+    return " ".join(words)
+
+
+def _evaluate(
+    name: str,
+    check: Callable[[str], str],
+    texts: list[str],
+    rng: random.Random,
+) -> None:
+    fixed = corrupted = false_corrections = altered = 0
+    elapsed = 0.0
+    for text in texts:
+        typo = _add_typo(text, rng)
+        proper = rng.choice(_PROPER_WORDS)
+        start = time.perf_counter()
+        results = [check(typo), check(text), check(f"{text} {proper}")]
+        elapsed += time.perf_counter() - start
+
+        if typo != text:
+            corrupted += 1
+            fixed += results[0].lower() == text.lower()
+        false_corrections += results[1] != text
+        altered += not results[2].endswith(proper)
+
+    print(f"{name}:")
+    print(f"  typos fixed:         {fixed}/{corrupted}")
+    print(f"  correct texts broken: {false_corrections}/{len(texts)}")
+    print(f"  names altered:       {altered}/{len(texts)}")
+    print(f"  latency:             {elapsed / (3 * len(texts)) * 1e3:.3f} ms/message")
+
+
+def _main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    texts = [text for text in _corpus.load_nlu_examples() if len(text.split()) > 1]
+    rng.shuffle(texts)
+    split = int(len(texts) * 0.8)
+    train, test = texts[:split], texts[split:]
+
+    symspell = SymSpell.from_texts(train, args.frequency_list)
+    _evaluate(
+        "symspell",
+        lambda text: symspell.correct(
+            text,
+            min_similarity=args.min_similarity,
+            ignore_capitalized=True,
+        ),
+        test,
+        random.Random(args.seed),
+    )
+
+    api_key = os.environ.get("BING_SEARCH_V7_SUBSCRIPTION_KEY")
+    if api_key is None:
+        print("bing: skipped, BING_SEARCH_V7_SUBSCRIPTION_KEY is not set")
+        return
+
+    with requests.Session() as session:
+        _evaluate(
+            "bing",
+            lambda text: _check_spelling(session, text, api_key, "en-US"),
+            test[: args.bing_limit],
+            random.Random(args.seed),
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frequency-list", required=True)
+    parser.add_argument("--min-similarity", type=float, default=0.8)
+    parser.add_argument("--bing-limit", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    _main(parser.parse_args())